@@ -1,38 +1,33 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-import time
+from harness import network, pacing
+from harness.browser import new_driver
+from harness.settings import shop_url
 
 def test_open_and_close_browser():
-    # Setup Chrome options
-    options = Options()
-    options.add_argument("--start-maximized")
-
-    # Use Selenium Manager (no need for chromedriver.exe path)
-    driver = webdriver.Chrome(options=options)
+    # Shared driver factory; network=True records every request through the DevTools performance log
+    driver = new_driver(network=True)
 
     try:
-        driver.get("http://localhost/minishop/index.php")
-
-        # wait a bit to allow CSS & resources to load
-        time.sleep(3)
+        # driver.get() returns after the load event, i.e. once the stylesheets have arrived
+        driver.get(shop_url("index.php"))
 
         # Check title or URL
         assert "Mini Shop" in driver.title or "index" in driver.current_url
 
-        # Verify CSS <link> is loaded
-        css_links = driver.find_elements(By.TAG_NAME, "link")
+        # Verify the CSS was actually fetched, from the requests the page made
+        entries = network.collect(driver)
+        stylesheets = [entry for entry in entries if entry["type"] == "Stylesheet"]
         print("\nLoaded CSS files:")
-        for link in css_links:
-            href = link.get_attribute("href")
-            if href:
-                print(href)
+        for entry in stylesheets:
+            print(f"{entry['url']}  {entry['status']}  {entry['size']} B  {entry['time']:.0f}ms  "
+                  f"cache={entry['cache']}")
 
-        assert any("css" in link.get_attribute("href") for link in css_links), \
+        assert any(entry["status"] in (200, 304) or entry["cache"] for entry in stylesheets), \
             "❌ No CSS file detected!"
+        for finding in network.check(entries):
+            print(f"⚠️ {finding}")
 
         print("✅ Page loaded with CSS successfully.")
 
     finally:
-        time.sleep(5)  # keep browser open for observation
+        pacing.pause(5)  # keep browser open for observation
         driver.quit()
@@ -0,0 +1,52 @@
+"""Page-load benchmarks for every minishop page (see harness/benchmark.py).
+
+Not part of the functional run: they are skipped unless --benchmark is given.
+
+    pytest benchmarks --benchmark --benchmark-save    # record a baseline
+    pytest benchmarks --benchmark                     # fail on regressions
+    pytest benchmarks --benchmark --benchmark-threshold 0.1 --benchmark-runs 20
+
+Run them without -n: every page is loaded --benchmark-runs times by one
+browser and the results are collected in this process.
+"""
+import pytest
+
+from harness import benchmark
+from harness.settings import shop_url
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.browser]
+
+
+@pytest.fixture
+def page_driver(request):
+    """Browser logged in as the role the page needs (anonymous for public pages)."""
+    def for_role(role):
+        if role is None:
+            return request.getfixturevalue("driver")
+        return request.getfixturevalue(f"login_{role}")
+    return for_role
+
+
+@pytest.mark.parametrize("page", list(benchmark.PAGES))
+def test_page_load(page, page_driver, pytestconfig, db, shop_customer):
+    role, path = benchmark.PAGES[page]
+    if page in ("cart", "pay"):
+        db.seed_cart_if_empty(shop_customer.id)   # an empty cart renders a different page
+    driver = page_driver(role)
+    url = shop_url(path)
+
+    benchmark.measure(driver, url)   # warm-up: session, CSS cache, PHP opcache
+    samples = [benchmark.measure(driver, url) for _ in range(pytestconfig.getoption("--benchmark-runs"))]
+    summary = benchmark.summarize(samples)
+    pytestconfig.benchmark_results[page] = summary
+    print(f"📌 {page}: " + ", ".join(f"{metric} {stats['median']}ms" for metric, stats in summary.items()))
+
+    if pytestconfig.getoption("--benchmark-save"):
+        return
+    baseline = benchmark.load_baseline(pytestconfig.getoption("--benchmark-baseline"))
+    if page not in baseline:
+        pytest.skip(f"no baseline for {page}; record one with --benchmark-save")
+    regressions = benchmark.compare(page, summary, baseline,
+                                    threshold=pytestconfig.getoption("--benchmark-threshold"),
+                                    min_delta_ms=pytestconfig.getoption("--benchmark-min-delta"))
+    assert not regressions, "⚠️ page got slower than the baseline:\n" + "\n".join(regressions)
@@ -0,0 +1,662 @@
+"""Shared fixtures for the minishop suite.
+
+Chrome is expensive to start and a typed login costs several seconds, so each
+pytest session (or each xdist worker) keeps one browser per role and hands the
+same, already logged-in driver to every test that asks for it. All browsers
+come from a warm pool (--browser-pool) that launches Chrome in the background
+before it is needed. Role browsers
+log in by POSTing index.php over HTTP and injecting the PHPSESSID cookie
+(--login-mode=ui types into the form instead):
+
+    login_admin     -> Chrome logged in as the admin account
+    login_customer  -> Chrome logged in as the customer account
+    driver          -> anonymous Chrome leased from the pool for one test
+
+With --isolated-data (always on under pytest-xdist) the process also gets its
+own customer account, product and therefore cart, so workers never touch
+each other's rows:
+
+    shop_customer   -> User handle the customer tests log in and shop as
+    shop_product    -> Product handle added to the cart by customer tests
+
+Tests that need their own rows declare them instead of chaining through
+class attributes, and get them from the `needs` fixture:
+
+    @pytest.mark.needs("product", stock=20, fresh=True)   -> needs.product
+
+Form-to-database checks that need no JavaScript also run without a browser
+(test_http_*.py) through logged-in HTTP sessions, so they take milliseconds:
+
+    admin_http      -> ShopClient logged in as the admin account
+    customer_http   -> ShopClient logged in as shop_customer
+    http_client     -> anonymous ShopClient
+
+When a browser test fails, the page source, screenshot, console log and URL
+of each driver it used are stored under --artifacts-dir in the background
+(see harness/artifacts.py); the failure report names the manifest files.
+Every run records which pages and tables each test touched (harness/impact.py);
+--changed admin/update_stock.php runs only the tests that hit that page and
+--skip-unchanged skips passing tests whose file and pages did not change.
+With --standin, users, products and cart are snapshotted before each test
+body and restored after it (--db-restore=module per test file; see
+harness/db.py), so rows a test creates or edits do not leak into the next.
+It is off by default against MySQL and with --shard, where other runs may
+share the tables, and always off under xdist.
+Every test's pass/fail and duration go into a SQLite history
+(--flake-history); a known-flaky test that fails is rerun once at the end of
+the session in fresh browsers (not under xdist), and the summary separates
+flaky from broken tests (see harness/flakes.py).
+--shard i/N runs one of N CI shards, balanced by those durations and with
+each role's browser tests kept together (see harness/schedule.py); -n
+spreads a shard over xdist workers as --dist decides.
+--network-capture DIR records every request of every browser test as a HAR
+file and flags slow, large or repeated ones (see harness/network.py).
+
+Tests that drive Chrome are marked `browser`, the others `http`; both run by
+default and `pytest -m http` is the quick pass that needs no Chrome at all.
+"""
+import os
+import shutil
+
+import pytest
+
+from harness import (artifacts, benchmark, db as shop_db, flakes, impact, network, pacing, schedule, settings,
+                     timing, workers)
+from harness.db import SQLiteDatabase, close_db, get_db
+from harness.factory import DataFactory, Product, User
+from harness.prereqs import Prerequisites
+from harness.standin import StandInShop
+from harness.browser import RoleBrowser
+from harness.client import ShopClient
+from harness.pool import POOL_SIZE, BrowserPool
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmarks", "baseline.json")
+ARTIFACTS_ROOT = os.path.join(os.path.dirname(__file__), "artifacts")
+FLAKE_HISTORY_PATH = os.path.join(os.path.dirname(__file__), ".flake-history.sqlite")
+HARNESS_DIR = os.path.join(os.path.dirname(__file__), "harness")
+BROWSER_FIXTURES = {"browser_pool", "driver", "login_admin", "login_customer", "admin_browser", "customer_browser"}
+SESSION_DATA_FIXTURES = ("shop_customer", "shop_product")    # session fixtures that may create rows
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("minishop")
+    group.addoption("--base-url", default=settings.BASE_URL,
+                    help="root URL of the minishop app (default: %(default)s)")
+    group.addoption("--standin", action="store_true",
+                    help="ignore --base-url and the MySQL settings; serve a fresh SQLite-backed "
+                         "stand-in of minishop from this process and test against it")
+    group.addoption("--admin-user", default=settings.ADMIN_USER)
+    group.addoption("--admin-password", default=settings.ADMIN_PASSWORD)
+    group.addoption("--customer-user", default=settings.CUSTOMER_USER)
+    group.addoption("--customer-password", default=settings.CUSTOMER_PASSWORD)
+    group.addoption("--product-name", default=settings.PRODUCT_NAME,
+                    help="existing product the customer tests add to the cart")
+    group.addoption("--isolated-data", action="store_true",
+                    help="create a private customer, product and cart for this process "
+                         "(implied when running under pytest-xdist)")
+    group.addoption("--login-mode", choices=("http", "ui"), default="http",
+                    help="how role fixtures log in: direct POST + cookie injection, "
+                         "or typing into index.php (default: %(default)s)")
+    group.addoption("--browser-profile", choices=("standard", "lean"), default=settings.BROWSER_PROFILE,
+                    help="Chrome profile: standard (maximized, everything loaded) or lean (no images, "
+                         "fonts, extensions, GPU or third-party requests) (default: %(default)s)")
+    group.addoption("--headless", action="store_true", default=settings.HEADLESS,
+                    help="run Chrome without a window")
+    group.addoption("--browser-pool", type=int, default=POOL_SIZE,
+                    help="browsers kept launched ahead of demand (default: %(default)s)")
+    group.addoption("--webdriver-timing", metavar="PATH", default=os.environ.get("MINISHOP_TIMING"),
+                    help="record the duration of every WebDriver command and write per-test and "
+                         "per-command histograms to PATH (JSON) plus a summary at the end")
+    group.addoption("--artifacts-dir", metavar="DIR", default=os.environ.get("MINISHOP_ARTIFACTS", ARTIFACTS_ROOT),
+                    help="where failing browser tests store page source, screenshot, console log and URL; "
+                         "one sub-directory per run, '' turns capturing off (default: tests/artifacts)")
+    group.addoption("--network-capture", metavar="DIR", default=os.environ.get("MINISHOP_NETWORK_CAPTURE"),
+                    help="record every request Chrome makes through the DevTools performance log and "
+                         "write one HAR file per browser test to DIR, flagging slow, large or repeated requests")
+    group.addoption("--network-size-budget", type=int, default=network.SIZE_BUDGET, metavar="BYTES",
+                    help="flag resources larger than this (default: %(default)s)")
+    group.addoption("--network-latency-budget", type=float, default=network.LATENCY_BUDGET_MS, metavar="MS",
+                    help="flag requests slower than this (default: %(default)s)")
+    group.addoption("--flake-history", metavar="PATH",
+                    default=os.environ.get("MINISHOP_FLAKE_HISTORY", FLAKE_HISTORY_PATH),
+                    help="SQLite file with every test's pass/fail and duration across runs; '' turns "
+                         "flake tracking and reruns off (default: tests/.flake-history.sqlite)")
+    group.addoption("--flake-reruns", type=int, default=1, metavar="N",
+                    help="rerun a failing known-flaky test up to N times at the end of the session, "
+                         "after every fixture is torn down; not under pytest-xdist (default: %(default)s)")
+    group.addoption("--flake-threshold", type=float, default=flakes.THRESHOLD,
+                    help="flip rate over the last runs from which a test counts as flaky (default: %(default)s)")
+    group.addoption("--shard", metavar="i/N",
+                    help="run only the i-th of N duration-balanced shards of the selected tests (CI jobs)")
+    group.addoption("--db-restore", choices=("test", "module", "off"),
+                    help="snapshot users/products/cart before each test (or module) and restore them "
+                         "afterwards (default: test with --standin, off otherwise and with --shard; "
+                         "always off under pytest-xdist, where workers share tables)")
+    group.addoption("--changed", metavar="LIST", action="append", default=[],
+                    help="comma-separated changed PHP files/pages (and table:NAME for schema or data "
+                         "changes); run only the tests the last recorded runs saw touching them")
+    group.addoption("--skip-unchanged", action="store_true",
+                    help="skip tests that passed last time and whose test file and pages are unchanged")
+    group.addoption("--app-root", metavar="DIR",
+                    help="minishop PHP source; pages are fingerprinted by file hash instead of over HTTP")
+    group.addoption("--benchmark", action="store_true",
+                    help="run the page-load benchmarks in benchmarks/ (skipped otherwise)")
+    group.addoption("--benchmark-runs", type=int, default=benchmark.RUNS,
+                    help="page loads per page (default: %(default)s)")
+    group.addoption("--benchmark-baseline", metavar="PATH", default=BASELINE_PATH,
+                    help="baseline JSON to compare against (default: benchmarks/baseline.json)")
+    group.addoption("--benchmark-save", action="store_true",
+                    help="write this run's results into the baseline file instead of comparing")
+    group.addoption("--benchmark-threshold", type=float, default=benchmark.THRESHOLD,
+                    help="allowed slowdown of median/p95 as a fraction of the baseline (default: %(default)s)")
+    group.addoption("--benchmark-min-delta", type=float, default=benchmark.MIN_DELTA_MS,
+                    help="slowdowns below this many ms never fail (default: %(default)s)")
+    group.addoption("--pace", choices=sorted(pacing.PROFILES),
+                    default=os.environ.get("MINISHOP_PACE", pacing.DEFAULT_PROFILE),
+                    help="deliberate pause profile: demo (watchable), ci or zero "
+                         "(no pauses) (default: %(default)s)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "browser: drives a real Chrome (Selenium)")
+    config.addinivalue_line("markers", "http: talks to the shop over plain HTTP, no browser")
+    config.addinivalue_line("markers", "benchmark: page-load benchmark, only run with --benchmark")
+    config.addinivalue_line("markers", "needs(kind, fresh=False, as_=None, **spec): data the test needs, "
+                                       "built in the DB by the `needs` fixture (see harness/prereqs.py)")
+    config.benchmark_results = {}
+    if config.getoption("--shard"):
+        try:
+            config.shard = schedule.parse_shard(config.getoption("--shard"))
+        except ValueError as exc:
+            raise pytest.UsageError(str(exc))
+    # Runs before test modules are imported, so their module-level URLs pick this up
+    settings.BASE_URL = config.getoption("--base-url")
+    settings.BROWSER_PROFILE = config.getoption("--browser-profile")
+    settings.HEADLESS = config.getoption("--headless")
+    pacing.use(config.getoption("--pace"))
+    if config.getoption("--webdriver-timing"):
+        timing.enable()
+    # A shared MySQL may hold other runs' rows (other shards, other machines): restoring would undo them
+    private = config.getoption("--standin") and not config.getoption("--shard")
+    config.db_restore = config.getoption("--db-restore") or ("test" if private else "off")
+    if workers.is_parallel():
+        config.db_restore = "off"    # restoring whole tables would undo the other workers' rows
+    config.snapshot_owner = None
+    config.snapshot_taken = False
+    config.network_findings = {}
+    config.flake_queue = []
+    history_path = config.getoption("--flake-history")
+    flakes.history = flakes.FlakeHistory(history_path, config.getoption("--flake-threshold")) if history_path else None
+    if config.getoption("--network-capture"):
+        settings.NETWORK_LOG = True
+        os.makedirs(config.getoption("--network-capture"), exist_ok=True)
+    artifacts_dir = config.getoption("--artifacts-dir")
+    config.artifacts = artifacts.ArtifactStore(artifacts_dir) if artifacts_dir else None
+    if config.getoption("--standin"):
+        config.standin = StandInShop().start()
+        settings.BASE_URL = config.standin.base_url
+        shop_db.SQLITE_PATH = config.standin.db_path
+
+
+def pytest_unconfigure(config):
+    standin = getattr(config, "standin", None)
+    if standin is not None:
+        standin.stop()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection_modifyitems(config, items):
+    _select_by_changes(config, items)
+    skip_benchmark = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords and not config.getoption("--benchmark"):
+            item.add_marker(skip_benchmark)
+        module = getattr(item, "module", None)
+        starts_chrome = hasattr(module, "webdriver") or hasattr(module, "new_driver")
+        if starts_chrome or BROWSER_FIXTURES.intersection(item.fixturenames) or item.get_closest_marker("browser"):
+            item.add_marker(pytest.mark.browser)
+        else:
+            item.add_marker(pytest.mark.http)
+    yield
+    # After -m / -k deselection: shards split what actually runs
+    if config.getoption("--shard"):
+        _keep_shard(config, items)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    # Book pauses and WebDriver commands in setup, call and teardown against the test that caused them
+    pacing.begin_test(item.nodeid)
+    timing.begin_test(item.nodeid)
+    impact.begin_test()
+    yield
+    pacing.end_test()
+    timing.end_test()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = (yield).get_result()
+    report.minishop_attempt = getattr(item, "minishop_attempt", 1)
+    if report.when == "call":
+        for _, driver in artifacts.drivers_of(getattr(item, "funcargs", {})):
+            impact.record_driver(driver)
+    elif report.when == "teardown":
+        report.minishop_touch = impact.end_test()
+    if item.config.getoption("--network-capture"):
+        if report.when == "setup":
+            # Launch, login and earlier tests' leftovers on long-lived role browsers: not this test's
+            for _, driver in artifacts.drivers_of(getattr(item, "funcargs", {})):
+                network.collect(driver)
+        elif report.when == "call":
+            _capture_network(item, report)
+    # By teardown the drivers have been handed back (blank or quit), nothing left to see
+    if not report.failed or report.when == "teardown":
+        return
+    store = item.config.artifacts
+    if store is not None:
+        manifests = [store.capture(item.nodeid, driver, report.when, name)
+                     for name, driver in artifacts.drivers_of(getattr(item, "funcargs", {}))]
+        if manifests:
+            report.sections.append(("failure artifacts", "\n".join(manifests)))
+    # xdist's workers only run what the controller hands them and accept no extra reports: no reruns there
+    if (flakes.history is not None and not workers.is_parallel()
+            and report.minishop_attempt <= item.config.getoption("--flake-reruns")
+            and flakes.history.is_flaky(item.nodeid)):
+        # Known-flaky: not a failure yet, it runs again after everything else (pytest_runtestloop)
+        report.outcome = "rerun"
+        item.config.flake_queue.append(item)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtestloop(session):
+    yield
+    # Every fixture, session-scoped ones included, was torn down after the last test:
+    # the reruns get new browsers, logins and data
+    while session.config.flake_queue and not (session.shouldfail or session.shouldstop):
+        queued, session.config.flake_queue = session.config.flake_queue, []
+        for index, item in enumerate(queued):
+            item.minishop_attempt = getattr(item, "minishop_attempt", 1) + 1
+            nextitem = queued[index + 1] if index + 1 < len(queued) else None
+            item.ihook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # xdist controller: fold each worker's WebDriver timings into one report
+    rows = getattr(node, "workeroutput", {}).get("minishop_timing")
+    if rows:
+        timing.merge(node.gateway.id, rows)
+
+
+def pytest_report_teststatus(report):
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+
+
+def _take_snapshot(config, owner):
+    try:
+        get_db().snapshot()
+    except Exception as exc:
+        config.db_restore = "off"
+        config.restore_note = f"--db-restore turned off, snapshot failed: {type(exc).__name__}: {exc}"
+        return False
+    config.snapshot_owner = owner
+    config.snapshot_taken = True
+    return True
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item):
+    # --db-restore=test: after the fixtures (session data they build must survive), before the test body
+    if item.config.db_restore == "test":
+        _take_snapshot(item.config, item.nodeid)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item, nextitem):
+    config = item.config
+    if config.db_restore != "test" or config.snapshot_owner != item.nodeid:
+        return    # failed in setup: never snapshotted, so nothing of its own to undo
+    config.snapshot_owner = None
+    get_db().restore()
+
+
+def pytest_runtest_logreport(report):
+    impact.add_report(report)
+    if flakes.history is not None and not workers.is_parallel():
+        flakes.history.add_report(report)    # the xdist controller records for all workers
+
+
+def _select_by_changes(config, items):
+    """--changed deselects unaffected tests, --skip-unchanged skips ones that cannot have changed."""
+    changes = [impact.normalise_change(change) for option in config.getoption("--changed")
+               for change in option.split(",") if change.strip()]
+    # No config.cache under -p no:cacheprovider: nothing recorded, so nothing to select by
+    if not (changes or config.getoption("--skip-unchanged")) or getattr(config, "cache", None) is None:
+        return
+    touch_map = config.cache.get(impact.CACHE_KEY, {})
+    if changes:
+        unplaced = impact.unplaced(changes, touch_map)
+        if unplaced:
+            config.impact_note = f"--changed: no recorded test touched {', '.join(unplaced)}; running everything"
+        else:
+            selected = [item for item in items if impact.affected(touch_map.get(item.nodeid), changes)]
+            deselected = [item for item in items if item not in selected]
+            config.impact_note = f"--changed: {len(selected)} affected tests selected, {len(deselected)} deselected"
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+                items[:] = selected
+    if config.getoption("--skip-unchanged"):
+        fingerprints = impact.Fingerprints(config.getoption("--app-root"))
+        skip = pytest.mark.skip(reason="unchanged since its last passing run (--skip-unchanged)")
+        hashes = {}
+        try:
+            for item in items:
+                path = str(item.path)
+                if path not in hashes:
+                    hashes[path] = impact.file_hash(path)
+                if impact.unchanged(touch_map.get(item.nodeid), hashes[path], fingerprints):
+                    item.add_marker(skip)
+        finally:
+            fingerprints.close()
+
+
+def _keep_shard(config, items):
+    """Keep this shard's share of a longest-first split; every xdist worker computes the same one."""
+    index, count = config.shard
+    known = flakes.history.mean_duration if flakes.history is not None else (lambda nodeid: None)
+    bins, loads = schedule.split(items, count, known)
+    kept = {item.nodeid for item in bins[index]}
+    deselected = [item for item in items if item.nodeid not in kept]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = bins[index]
+    config.schedule_note = (f"--shard {index + 1}/{count}: {len(items)} tests, ~{loads[index]:.0f}s "
+                            f"estimated; shards range {min(loads):.0f}-{max(loads):.0f}s")
+
+
+def _capture_network(item, report):
+    """Drain each driver's performance log into a HAR file named after the test."""
+    config = item.config
+    for name, driver in artifacts.drivers_of(getattr(item, "funcargs", {})):
+        entries = network.collect(driver)
+        if not entries:
+            continue
+        findings = network.check(entries, config.getoption("--network-size-budget"),
+                                 config.getoption("--network-latency-budget"))
+        path = os.path.join(config.getoption("--network-capture"),
+                            artifacts.safe_name(f"{item.nodeid}__{name}") + ".har")
+        network.write_har(path, entries, findings, comment=item.nodeid)
+        config.network_findings[path] = findings
+        if findings:
+            report.sections.append((f"network ({name})", "\n".join(findings)))
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if getattr(config, "cache", None) is not None and impact.results and not hasattr(config, "workerinput"):
+        # xdist workers ship their touches in the reports; only the controller writes the map
+        fingerprints = impact.Fingerprints(config.getoption("--app-root"))
+        try:
+            touch_map = impact.update_map(config.cache.get(impact.CACHE_KEY, {}), str(config.rootpath),
+                                          fingerprints)
+        finally:
+            fingerprints.close()
+        config.cache.set(impact.CACHE_KEY, touch_map)
+    if flakes.history is not None and not hasattr(config, "workerinput"):
+        flakes.history.save()
+    if session.config.artifacts is not None:
+        session.config.artifacts.close()
+    if session.config.snapshot_taken:
+        get_db().drop_snapshot()    # the db fixture may have closed the pool already: this reopens it
+        close_db()
+    if session.config.benchmark_results and session.config.getoption("--benchmark-save"):
+        benchmark.save_baseline(session.config.getoption("--benchmark-baseline"),
+                                session.config.benchmark_results)
+    timing_path = session.config.getoption("--webdriver-timing")
+    if timing_path and timing.records:
+        # Every xdist worker writes its own file; the controller writes what they sent it (timing.merge)
+        session.config.timing_report = timing.write_report(timing_path)
+        if hasattr(config, "workeroutput"):
+            config.workeroutput["minishop_timing"] = [list(row) for row in timing.records]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    lines = pacing.report(limit=None if config.option.verbose > 0 else 10)
+    if lines:
+        terminalreporter.write_sep("-", "deliberate pauses")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+    if config.benchmark_results:
+        baseline = benchmark.load_baseline(config.getoption("--benchmark-baseline"))
+        terminalreporter.write_sep("-", "page load ms: median (p95)")
+        for line in benchmark.report(config.benchmark_results, baseline):
+            terminalreporter.write_line(line)
+        if config.getoption("--benchmark-save"):
+            terminalreporter.write_line(f"baseline saved to {config.getoption('--benchmark-baseline')}")
+
+    if flakes.history is not None and not hasattr(config, "workerinput"):
+        lines = flakes.history.report()
+        if lines:
+            terminalreporter.write_sep("-", "flaky or broken")
+            for line in lines:
+                terminalreporter.write_line(line)
+
+    for title, attribute in (("database restore", "restore_note"), ("change-based selection", "impact_note"),
+                             ("schedule", "schedule_note")):
+        note = getattr(config, attribute, None)
+        if note:
+            terminalreporter.write_sep("-", title)
+            terminalreporter.write_line(note)
+
+    if config.network_findings:
+        flagged = {path: findings for path, findings in config.network_findings.items() if findings}
+        terminalreporter.write_sep("-", "network")
+        terminalreporter.write_line(f"{len(config.network_findings)} HAR files in "
+                                    f"{config.getoption('--network-capture')}, {len(flagged)} with findings")
+        limit = None if config.option.verbose > 0 else 10
+        for path, findings in list(flagged.items())[:limit]:
+            terminalreporter.write_line(f"  {os.path.basename(path)}")
+            for finding in findings[:limit]:
+                terminalreporter.write_line(f"    {finding}")
+
+    store = config.artifacts
+    if store is not None and store.failures:
+        terminalreporter.write_sep("-", "failure artifacts")
+        terminalreporter.write_line(f"{store.failures} captures, {store.stored} files written, "
+                                    f"{store.deduplicated} duplicates skipped, in {store.directory}")
+
+    report_path = getattr(config, "timing_report", None)
+    if report_path:
+        terminalreporter.write_sep("-", "webdriver commands")
+        for line in timing.summary(limit=None if config.option.verbose > 0 else 10):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"histograms written to {report_path}")
+
+
+# ---------- DATABASE ----------
+@pytest.fixture(scope="session")
+def db():
+    """Pooled connections for DB oracles; see harness/db.py."""
+    yield get_db()
+    close_db()
+
+
+@pytest.fixture(scope="session")
+def factory(db):
+    """Bulk users/products/cart rows, deleted again at the end of the session."""
+    data = DataFactory(db)
+    yield data
+    data.cleanup()
+
+
+@pytest.fixture(scope="session")
+def prerequisites(factory):
+    return Prerequisites(factory)
+
+
+@pytest.fixture
+def needs(request, prerequisites):
+    """What the test's @pytest.mark.needs(...) markers ask for, e.g. needs.product."""
+    return prerequisites.for_markers(request.node.iter_markers("needs"))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def module_snapshot(request, pytestconfig):
+    """--db-restore=module: snapshot before the module's first test, restore after its last.
+
+    Session data a later test of the module would build (shop_customer,
+    shop_product, shared `needs`) is built first, so it is in the snapshot
+    and survives the restore for the modules after this one.
+    """
+    if pytestconfig.db_restore != "module":
+        yield
+        return
+    tests = [item for item in request.session.items if getattr(item, "module", None) is request.module]
+    for name in SESSION_DATA_FIXTURES:
+        if any(name in test.fixturenames for test in tests):
+            request.getfixturevalue(name)
+    if any(test.get_closest_marker("needs") for test in tests):
+        request.getfixturevalue("prerequisites").share(
+            marker for test in tests for marker in test.iter_markers("needs"))
+    if not _take_snapshot(pytestconfig, request.module):
+        yield
+        return
+    yield
+    pytestconfig.snapshot_owner = None
+    get_db().restore()
+
+
+@pytest.fixture(scope="session")
+def isolated_data(pytestconfig):
+    return pytestconfig.getoption("--isolated-data") or workers.is_parallel()
+
+
+@pytest.fixture(scope="session")
+def shop_customer(pytestconfig, db, factory, isolated_data):
+    if isolated_data:
+        return factory.user(prefix="cust")
+    username = pytestconfig.getoption("--customer-user")
+    return User(db.get_user_id(username), username,
+                pytestconfig.getoption("--customer-password"), "customer")
+
+
+@pytest.fixture(scope="session")
+def shop_product(pytestconfig, db, factory, isolated_data):
+    if isolated_data:
+        return factory.product(prefix="Product", stock=1000)
+    name = pytestconfig.getoption("--product-name")
+    row = db.query_one("SELECT id, name, price, stock FROM products WHERE name = %s", (name,))
+    return Product(*row) if row else Product(None, name, None, None)
+
+
+# ---------- BROWSERS ----------
+@pytest.fixture(scope="session")
+def browser_pool(pytestconfig):
+    """Chrome processes launched in the background; see harness/pool.py."""
+    pool = BrowserPool(size=pytestconfig.getoption("--browser-pool"))
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def admin_browser(pytestconfig, browser_pool):
+    role = RoleBrowser("admin",
+                       pytestconfig.getoption("--admin-user"),
+                       pytestconfig.getoption("--admin-password"),
+                       pytestconfig.getoption("--login-mode"),
+                       pool=browser_pool)
+    yield role
+    role.quit()
+
+
+@pytest.fixture(scope="session")
+def customer_browser(pytestconfig, shop_customer, browser_pool):
+    role = RoleBrowser("customer", shop_customer.username, shop_customer.password,
+                       pytestconfig.getoption("--login-mode"), pool=browser_pool)
+    yield role
+    role.quit()
+
+
+@pytest.fixture
+def login_admin(admin_browser):
+    yield admin_browser.acquire()
+    admin_browser.release()
+
+
+@pytest.fixture
+def login_customer(customer_browser):
+    yield customer_browser.acquire()
+    customer_browser.release()
+
+
+@pytest.fixture
+def driver(browser_pool):
+    """Anonymous Chrome for tests that do their own login/signup; recycled afterwards."""
+    leased = browser_pool.lease()
+    yield leased
+    browser_pool.release(leased)
+
+
+# ---------- HTTP SESSIONS ----------
+@pytest.fixture
+def http_client():
+    """Fresh cookie jar, not logged in."""
+    with ShopClient() as client:
+        yield client
+
+
+@pytest.fixture
+def admin_http(pytestconfig):
+    with ShopClient() as client:
+        client.login("admin", pytestconfig.getoption("--admin-user"),
+                     pytestconfig.getoption("--admin-password"))
+        yield client
+
+
+@pytest.fixture
+def customer_http(shop_customer):
+    with ShopClient() as client:
+        client.login("customer", shop_customer.username, shop_customer.password)
+        yield client
+
+
+
+# ---------- HARNESS CHECKS ----------
+# test_standin.py, test_flakes.py, test_pool.py, ... check the harness itself without Chrome or MySQL
+pytest_plugins = ["pytester"]
+
+
+@pytest.fixture(scope="module")
+def standin(pytestconfig):
+    """The --standin shop when there is one, otherwise a private one for this module."""
+    running = getattr(pytestconfig, "standin", None)
+    if running is not None:
+        yield running
+        return
+    shop = StandInShop().start()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "BASE_URL", shop.base_url)
+        yield shop
+    shop.stop()
+
+
+@pytest.fixture(scope="module")
+def standin_db(standin):
+    database = SQLiteDatabase(standin.db_path)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def suite(pytester, monkeypatch):
+    """An empty test directory with this conftest.py and harness; run it with runpytest_subprocess."""
+    # Run under -n, the inner pytest would inherit this worker's identity and think it is an xdist worker too
+    for name in ("PYTEST_XDIST_WORKER", "PYTEST_XDIST_WORKER_COUNT", "PYTEST_XDIST_TESTRUNUID"):
+        monkeypatch.delenv(name, raising=False)
+    with open(__file__, encoding="utf-8") as source:
+        pytester.makeconftest(source.read())
+    shutil.copytree(HARNESS_DIR, pytester.path / "harness", ignore=shutil.ignore_patterns("__pycache__"))
+    return pytester
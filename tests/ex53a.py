@@ -1,23 +1,25 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-import time
 
-def test_open_minishop_home():
-    # Setup Chrome
-    driver = webdriver.Chrome()
-    driver.maximize_window()
+from harness import pacing
+from harness.browser import new_driver
+from harness.settings import shop_url
 
+# `driver` is an anonymous browser leased from the pool in conftest.py (reset, not relaunched, between tests)
+def test_open_minishop_home(driver):
     # Step 1: Open the browser and navigate to the site
-    driver.get("http://localhost/minishop/index.php")
+    driver.get(shop_url("index.php"))
 
-    time.sleep(2)  # Let the page load
+    pacing.pause(2)  # Let the page load
 
     # Step 2: Verify title or a specific element
     assert "MiniShop" in driver.title or driver.find_element(By.TAG_NAME, "body"), "❌ Home page did not load"
 
     print("✅ Home page opened successfully.")
-    driver.quit()
 
 # Run it directly if this script is standalone
 if __name__ == "__main__":
-    test_open_minishop_home()
+    standalone = new_driver()
+    try:
+        test_open_minishop_home(standalone)
+    finally:
+        standalone.quit()
@@ -1,16 +1,9 @@
-import pytest
-from selenium import webdriver
+from harness.settings import shop_url
 
-@pytest.fixture
-def driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(options=options)
-    yield driver
-    driver.quit()
+# `driver` is an anonymous browser leased from the pool in conftest.py
 
 def test_open_browser_and_delete_cookies(driver):
-    driver.get("http://localhost/minishop/index.php")
+    driver.get(shop_url("index.php"))
     
     # Get initial PHPSESSID
     initial_session = None
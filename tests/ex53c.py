@@ -1,23 +1,22 @@
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 import time
 
+from harness.settings import shop_url
+
 USERNAME = "user"     # change to an existing DB username
 PASSWORD = "123"      # change to that user's password
 
 @pytest.fixture
-def driver():
-    options = Options()
-    options.add_argument("--window-size=1280,800")  # Set window size
-    driver = webdriver.Chrome(options=options)
+def driver(browser_pool):
+    driver = browser_pool.lease()
+    driver.set_window_size(1280, 800)  # Set window size
     yield driver
-    driver.quit()
+    browser_pool.release(driver)
 
 def test_print_session_for_user(driver):
     # 1. Open login page
-    driver.get("http://localhost/miniishop/index.php")
+    driver.get(shop_url("index.php"))
 
     # 2. Fill username and password fields
     driver.find_element(By.NAME, "username").send_keys(USERNAME)
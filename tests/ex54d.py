@@ -1,17 +1,18 @@
-import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 import time
 
+from harness.settings import shop_url
+
 USERNAME = "user"     # Change to a valid username
 PASSWORD = "123"      # Change to matching password
-BASE_URL = "http://localhost/miniishop/index.php"
+BASE_URL = shop_url("index.php")
 
-def start_driver():
-    options = Options()
-    options.add_argument("--window-size=1280,800")
-    return webdriver.Chrome(options=options)
+def start_driver(browser_pool):
+    # This test is about a browser *restart*, so it uses two separate Chrome
+    # processes: the first is discarded (really quit) instead of recycled.
+    driver = browser_pool.lease()
+    driver.set_window_size(1280, 800)
+    return driver
 
 def login_and_get_session(driver):
     driver.get(BASE_URL)
@@ -26,9 +27,9 @@ def login_and_get_session(driver):
     session_id = driver.get_cookie("PHPSESSID")
     return cookies, session_id
 
-def test_session_behavior():
+def test_session_behavior(browser_pool):
     print("\n=== Test 1: Login and Get Session ===")
-    driver = start_driver()
+    driver = start_driver(browser_pool)
     cookies, session_id = login_and_get_session(driver)
 
     print("\n--- Cookies after login ---")
@@ -40,12 +41,12 @@ def test_session_behavior():
     else:
         print("\nNo PHPSESSID found — login might have failed.")
 
-    driver.quit()
+    browser_pool.release(driver, discard=True)
     print("\nBrowser closed. Waiting 3 seconds before reopening...")
     time.sleep(3)
 
     print("\n=== Test 2: Reopen Browser and Check Session ===")
-    driver2 = start_driver()
+    driver2 = start_driver(browser_pool)
     driver2.get(BASE_URL)
     time.sleep(2)
 
@@ -55,4 +56,4 @@ def test_session_behavior():
     else:
         print("⚠ Session persisted — user is still logged in.")
 
-    driver2.quit()
+    browser_pool.release(driver2, discard=True)
@@ -0,0 +1 @@
+"""Shared helpers for the minishop Selenium suite (browsers, logins, settings)."""
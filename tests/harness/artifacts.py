@@ -0,0 +1,142 @@
+"""What the browser showed when a test failed, stored off the test thread.
+
+On a failing test the conftest hook calls capture() for every driver the
+test used. Only the WebDriver round trips happen on the test thread: URL,
+page source, screenshot and browser console log. Hashing, gzip and the disk
+writes are queued to one background thread, so a server outage that fails
+forty tests at once does not also stall the run for forty synchronous dumps.
+
+Files are content-addressed inside one directory per run, so the same error
+page captured by twenty tests is stored once:
+
+    artifacts/<date>-<run token>/
+        objects/3f/3f9c...e1.html.gz       page source (gzip)
+        objects/a0/a07b...42.png           screenshot (PNG is compressed already)
+        objects/c4/c41d...9b.log.json.gz   console log
+        failures/test_cart.py__TestCart__test_update_cart__call.json
+            {"nodeid", "when", "driver", "url", "artifacts": {"html": "objects/...", ...}}
+
+All xdist workers of one run share the directory; writes go through a temp
+file and a rename, so two workers storing the same page do not collide.
+"""
+import gzip
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from harness import workers
+
+# kind -> (file suffix, gzip it)
+KINDS = {
+    "html": (".html.gz", True),
+    "screenshot": (".png", False),
+    "console": (".log.json.gz", True),
+}
+
+
+def run_directory(root):
+    """Directory shared by every worker of this run, e.g. artifacts/20250101-a1b2c3."""
+    return os.path.join(root, f"{time.strftime('%Y%m%d')}-{workers.RUN_TOKEN}")
+
+
+def drivers_of(funcargs):
+    """(fixture name, driver) for each distinct WebDriver among a test's fixtures."""
+    seen = set()
+    for name, value in funcargs.items():
+        if isinstance(value, WebDriver) and id(value) not in seen:
+            seen.add(id(value))
+            yield name, value
+
+
+def safe_name(text):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", text).strip("_")[:150]
+
+
+def _grab(driver):
+    """WebDriver round trips only; anything the dead or busy browser refuses is skipped."""
+    captured, url = {}, None
+    try:
+        url = driver.current_url
+    except Exception:
+        pass
+    try:
+        captured["html"] = driver.page_source.encode("utf-8")
+    except Exception:
+        pass
+    try:
+        captured["screenshot"] = driver.get_screenshot_as_png()
+    except Exception:
+        pass
+    try:
+        captured["console"] = json.dumps(driver.get_log("browser"), indent=1).encode("utf-8")
+    except Exception:
+        pass    # chromedriver without goog:loggingPrefs, or a driver with no log support
+    return url, captured
+
+
+class ArtifactStore:
+    def __init__(self, root):
+        self.directory = run_directory(root)
+        self.failures = 0
+        self.stored = 0
+        self.deduplicated = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._drain, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    # ---------- PUBLIC API ----------
+    def capture(self, nodeid, driver, when="call", name="driver"):
+        """Grab the driver's state now, write it in the background; returns the manifest path."""
+        url, captured = _grab(driver)
+        manifest = os.path.join(self.directory, "failures", safe_name(f"{nodeid}__{name}__{when}") + ".json")
+        self.failures += 1
+        self._queue.put((manifest, {"nodeid": nodeid, "when": when, "driver": name, "url": url}, captured))
+        return manifest
+
+    def close(self):
+        """Wait for every queued capture to be on disk."""
+        self._queue.put(None)
+        self._thread.join()
+
+    # ---------- WRITER THREAD ----------
+    def _drain(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._write(*job)
+            except Exception as exc:
+                # One bad capture must not stop the writer: every later one would be queued forever
+                print(f"⚠️ Could not store failure artifacts for {job[1]['nodeid']}: {type(exc).__name__}: {exc}")
+
+    def _write(self, manifest, record, captured):
+        record["artifacts"] = {kind: self._store(kind, data) for kind, data in captured.items()}
+        self._atomic_write(manifest, json.dumps(record, indent=2).encode("utf-8"))
+
+    def _store(self, kind, data):
+        suffix, compress = KINDS[kind]
+        digest = hashlib.sha256(data).hexdigest()
+        relative = os.path.join("objects", digest[:2], digest + suffix)
+        path = os.path.join(self.directory, relative)
+        if os.path.exists(path):
+            self.deduplicated += 1
+        else:
+            # mtime=0 keeps the gzip bytes identical for identical input
+            self._atomic_write(path, gzip.compress(data, mtime=0) if compress else data)
+            self.stored += 1
+        return relative
+
+    @staticmethod
+    def _atomic_write(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{workers.WORKER_ID}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
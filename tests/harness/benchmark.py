@@ -0,0 +1,133 @@
+"""Page-load timings from the browser, summarised and compared to a baseline.
+
+Each sample is one driver.get() of a page followed by a read of the
+Navigation Timing entry and the Paint Timing entries the browser recorded
+for it (all in milliseconds from navigation start):
+
+    ttfb        responseStart - requestStart (server time for the PHP page)
+    response    responseEnd
+    interactive domInteractive
+    dcl         domContentLoadedEventEnd
+    load        loadEventEnd
+    fp / fcp    first-paint / first-contentful-paint
+
+summarize() reduces the samples of one page to min/median/p95 per metric.
+compare() checks the medians and p95s against a saved baseline and returns
+one message per metric that got slower than the allowed threshold.
+"""
+import json
+import os
+import statistics
+import time
+
+# name -> (role that must be logged in or None, path)
+PAGES = {
+    "index": (None, "index.php"),
+    "signup": (None, "signup.php"),
+    "customer_home": ("customer", "customer/customer_home.php"),
+    "customer_home_search": ("customer", "customer/customer_home.php?search=a"),
+    "cart": ("customer", "customer/cart.php"),
+    "pay": ("customer", "customer/pay.php"),
+    "admin_home": ("admin", "admin/admin_home.php"),
+    "add_product": ("admin", "admin/add_product.php"),
+    "delete_product": ("admin", "admin/delete_product.php"),
+    "update_stock": ("admin", "admin/update_stock.php"),
+}
+
+METRICS = ("ttfb", "response", "interactive", "dcl", "load", "fp", "fcp")
+RUNS = 10
+THRESHOLD = 0.20     # allowed slowdown as a fraction of the baseline
+MIN_DELTA_MS = 20    # slowdowns smaller than this are noise, whatever the fraction
+LOAD_WAIT = 10
+
+TIMING_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+if (!nav || nav.loadEventEnd === 0) { return null; }
+const paint = {};
+for (const entry of performance.getEntriesByType("paint")) { paint[entry.name] = entry.startTime; }
+return {
+    ttfb: nav.responseStart - nav.requestStart,
+    response: nav.responseEnd,
+    interactive: nav.domInteractive,
+    dcl: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    fp: paint["first-paint"] === undefined ? null : paint["first-paint"],
+    fcp: paint["first-contentful-paint"] === undefined ? null : paint["first-contentful-paint"],
+};
+"""
+
+
+def measure(driver, url, timeout=LOAD_WAIT):
+    """Load `url` once and return its timing metrics."""
+    driver.get(url)
+    deadline = time.monotonic() + timeout
+    while True:
+        # driver.get() returns on the load event; loadEventEnd is set just after it
+        sample = driver.execute_script(TIMING_JS)
+        if sample is not None:
+            return sample
+        if time.monotonic() >= deadline:
+            raise AssertionError(f"⚠️ {url} never finished loading (loadEventEnd stayed 0)")
+        time.sleep(0.01)
+
+
+def _percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples):
+    """{metric: {"min", "median", "p95"}} over the samples that reported the metric."""
+    summary = {}
+    for metric in METRICS:
+        values = [sample[metric] for sample in samples if sample.get(metric) is not None]
+        if values:
+            summary[metric] = {
+                "min": round(min(values), 1),
+                "median": round(statistics.median(values), 1),
+                "p95": round(_percentile(values, 95), 1),
+            }
+    return summary
+
+
+def compare(page, summary, baseline, threshold=THRESHOLD, min_delta_ms=MIN_DELTA_MS):
+    """Regression messages for `page`; empty when there is no baseline for it."""
+    regressions = []
+    for metric, stats in summary.items():
+        base = baseline.get(page, {}).get(metric)
+        if not base:
+            continue
+        for stat in ("median", "p95"):
+            allowed = base[stat] + max(base[stat] * threshold, min_delta_ms)
+            if stats[stat] > allowed:
+                regressions.append(f"{page} {metric} {stat}: {stats[stat]:.1f}ms "
+                                   f"(baseline {base[stat]:.1f}ms, allowed {allowed:.1f}ms)")
+    return regressions
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    """Merge `results` ({page: summary}) into the baseline file at `path`."""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def report(results, baseline):
+    """Lines for the terminal: median (p95) of the key metrics per page."""
+    lines = [f"{'page':<22} {'ttfb':>16} {'dcl':>16} {'load':>16} {'fcp':>16}"]
+    for page, summary in results.items():
+        cells = []
+        for metric in ("ttfb", "dcl", "load", "fcp"):
+            stats = summary.get(metric)
+            cells.append(f"{stats['median']:7.1f} ({stats['p95']:6.1f})" if stats else f"{'-':>16}")
+        marker = "" if page in baseline else "  (no baseline)"
+        lines.append(f"{page:<22} " + " ".join(cells) + marker)
+    return lines
@@ -0,0 +1,276 @@
+"""Starting Chrome and logging it into minishop."""
+import functools
+import json
+import os
+from urllib.parse import urlsplit
+
+import requests
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+from harness import settings, timing
+from harness.client import SESSION_COOKIE, ShopClient
+from harness.pages import LoginPage
+
+LOGIN_WAIT = 10
+
+# Explicit chromedriver/Chrome binaries; otherwise resolved once and cached in PATHS_CACHE
+CHROMEDRIVER = os.environ.get("MINISHOP_CHROMEDRIVER")
+CHROME_BINARY = os.environ.get("MINISHOP_CHROME")
+PATHS_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "minishop", "chrome-paths.json")
+
+WINDOW_SIZE = "1366,768"
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--blink-settings=imagesEnabled=false",
+]
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+BLOCKED_URLS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+                "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"]
+LOCAL_HOSTS = ("localhost", "127.0.0.1")
+
+
+# ---------- DRIVER ----------
+def _usable(paths):
+    return bool(paths) and all(path and os.path.isfile(path) for path in paths.values())
+
+
+@functools.lru_cache(maxsize=None)
+def chrome_paths():
+    """{"driver_path", "browser_path"} for Chrome, resolved once per process.
+
+    Order: MINISHOP_CHROMEDRIVER/MINISHOP_CHROME, the paths cached by an
+    earlier run, Selenium Manager's offline lookup in its own cache, and only
+    then a Selenium Manager run that may download. Whatever is found is
+    written to PATHS_CACHE so the next process skips Selenium Manager.
+    """
+    if CHROMEDRIVER:
+        return {"driver_path": CHROMEDRIVER, "browser_path": CHROME_BINARY or ""}
+    try:
+        with open(PATHS_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+        if _usable(cached):
+            return cached
+    except (OSError, ValueError):
+        pass
+
+    args = ["--browser", "chrome"] + (["--browser-path", CHROME_BINARY] if CHROME_BINARY else [])
+    try:
+        paths = SeleniumManager().binary_paths(args + ["--offline"])
+    except Exception:
+        paths = None
+    if not _usable(paths):
+        paths = SeleniumManager().binary_paths(args)
+    paths = {"driver_path": paths["driver_path"], "browser_path": paths["browser_path"]}
+    os.makedirs(os.path.dirname(PATHS_CACHE), exist_ok=True)
+    with open(PATHS_CACHE, "w", encoding="utf-8") as f:
+        json.dump(paths, f)
+    return paths
+
+
+def chrome_options(profile=None, headless=None, network=None):
+    """ChromeOptions for a profile ("standard" or "lean"), defaults from settings."""
+    profile = profile or settings.BROWSER_PROFILE
+    headless = settings.HEADLESS if headless is None else headless
+    network = settings.NETWORK_LOG if network is None else network
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={WINDOW_SIZE}")
+    elif profile == "lean":
+        options.add_argument(f"--window-size={WINDOW_SIZE}")
+    else:
+        options.add_argument("--start-maximized")
+    if profile == "lean":
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", LEAN_PREFS)
+        # Every host except the shop's (and the local machine) fails DNS: no third-party requests
+        shop_host = urlsplit(settings.BASE_URL).hostname
+        allowed = dict.fromkeys((shop_host,) + LOCAL_HOSTS)
+        options.add_argument("--host-resolver-rules=MAP * ~NOTFOUND, "
+                             + ", ".join(f"EXCLUDE {host}" for host in allowed if host))
+    elif profile != "standard":
+        raise ValueError(f"unknown browser profile {profile!r}")
+    # Keep the console log readable through driver.get_log("browser") for failure artifacts
+    logging = {"browser": "ALL"}
+    if network:
+        # Network.* events for driver.get_log("performance"); see network.py
+        logging["performance"] = "ALL"
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    options.set_capability("goog:loggingPrefs", logging)
+    return options
+
+
+def new_driver(profile=None, headless=None, network=None):
+    """Start Chrome from the cached binary paths with the given profile."""
+    profile = profile or settings.BROWSER_PROFILE
+    options = chrome_options(profile, headless, network)
+    paths = chrome_paths()
+    if paths["browser_path"]:
+        options.binary_location = paths["browser_path"]
+    driver = timing.instrument(
+        webdriver.Chrome(options=options, service=Service(executable_path=paths["driver_path"]))
+    )
+    if profile == "lean":
+        # Fonts have no content setting; drop them (and any image the setting missed) at the network layer
+        driver._blocked_urls = BLOCKED_URLS
+        _block_urls(driver)
+    return driver
+
+
+def _block_urls(driver):
+    # Per tab: a tab opened later (see reset) needs it again
+    blocked = getattr(driver, "_blocked_urls", None)
+    if blocked:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+
+
+# ---------- RESET ----------
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") else None
+
+
+def _visited_origins(driver):
+    """Origins in the current tab's back/forward history."""
+    history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+    return {_origin(entry["url"]) for entry in history["entries"]} - {None}
+
+
+def reset(driver):
+    """Make a running Chrome as clean as a new one, in a few DevTools round trips.
+
+    Every tab is replaced by one new about:blank tab (which also drops their
+    sessionStorage), then all cookies and the HTTP cache are cleared, and
+    for the shop and every origin those tabs visited: localStorage,
+    IndexedDB, Cache Storage and service workers. Without DevTools (not
+    Chrome) it falls back to clearing the current page's storage and
+    cookies. If a step fails partway the browser is in no known state, so
+    the error propagates and BrowserPool replaces the browser.
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        return
+    stale = driver.window_handles
+    origins = {_origin(settings.BASE_URL)}
+    for handle in stale:
+        driver.switch_to.window(handle)
+        origins |= _visited_origins(driver)
+    driver.switch_to.new_window("tab")
+    fresh = driver.current_window_handle
+    for handle in stale:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(fresh)
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    for origin in sorted(origins - {None}):
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    _block_urls(driver)
+
+
+# ---------- UI LOGIN ----------
+def ui_login(driver, role, username, password):
+    """Log in through the index.php form and wait for the role's home page."""
+    page = LoginPage(driver).open()
+    page.login(username, password)
+    page.wait_for_url(settings.HOME_PAGES[role], timeout=LOGIN_WAIT)
+
+
+# ---------- HTTP LOGIN ----------
+def http_login(role, username, password):
+    """POST the index.php login form over plain HTTP and return the PHPSESSID.
+
+    The form is fetched first so hidden fields and the submit button's
+    name/value are sent exactly as a browser would send them.
+    """
+    with ShopClient() as client:
+        client.login(role, username, password)
+        return client.session_id
+
+
+def inject_session(driver, role, session_id):
+    """Hand an HTTP-authenticated PHP session to the browser and open the role's home."""
+    if not driver.current_url.startswith(settings.BASE_URL):
+        # add_cookie only works for the origin the browser is currently on
+        driver.get(settings.shop_url("index.php"))
+    driver.delete_all_cookies()
+    driver.add_cookie({"name": SESSION_COOKIE, "value": session_id, "path": "/"})
+    home = settings.shop_url(settings.HOME_PAGES[role])
+    driver.get(home)
+    if settings.HOME_PAGES[role] not in driver.current_url:
+        raise RuntimeError(f"Injected session was not accepted, browser is at {driver.current_url}")
+
+
+class RoleBrowser:
+    """One long-lived Chrome logged in as a given role.
+
+    Tests are free to navigate anywhere, including clicking Logout. After each
+    test we look at where the browser was left: anything outside the role's
+    own area (e.g. index.php after Logout or "Back to Index") is treated as a
+    lost session and the next test logs in again before it starts.
+
+    login_mode "http" logs in with a direct POST and injects the session
+    cookie; it falls back to typing into the form if that fails. The typed
+    login itself stays covered by test_login.py.
+    """
+
+    def __init__(self, role, username, password, login_mode="http", pool=None):
+        self.role = role
+        self.username = username
+        self.password = password
+        self.login_mode = login_mode
+        self.pool = pool    # BrowserPool to lease Chrome from, or None to launch one
+        self.area = "/" + settings.HOME_PAGES[role].split("/")[0] + "/"
+        self.driver = None
+        self.logged_in = False
+
+    def acquire(self):
+        if self.driver is None:
+            self.driver = self.pool.lease() if self.pool else new_driver()
+        if not self.logged_in:
+            self.login()
+            self.logged_in = True
+        return self.driver
+
+    def login(self):
+        if self.login_mode == "http":
+            try:
+                session_id = http_login(self.role, self.username, self.password)
+                inject_session(self.driver, self.role, session_id)
+                return
+            except (requests.RequestException, RuntimeError) as exc:
+                print(f"⚠️ HTTP login as {self.role} failed ({exc}); falling back to the login form")
+        ui_login(self.driver, self.role, self.username, self.password)
+
+    def release(self):
+        try:
+            self.logged_in = self.area in self.driver.current_url
+        except Exception:
+            self.logged_in = False
+
+    def quit(self):
+        if self.driver is not None:
+            if self.pool:
+                self.pool.release(self.driver)
+            else:
+                self.driver.quit()
+            self.driver = None
+        self.logged_in = False
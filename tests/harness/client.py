@@ -0,0 +1,232 @@
+"""Browserless access to minishop: a requests session plus a small HTML tree.
+
+Most minishop checks are "submit a form, look at the DB" and need no
+JavaScript. ShopClient does what the browser would do for those: it keeps
+the PHPSESSID cookie, fetches a page, fills in one of its forms (hidden
+fields and the clicked button's name/value included) and posts it back.
+
+    client = ShopClient()
+    client.login("customer", "abc", "abc")
+    cart = client.get("customer/cart.php")
+    form = cart.form(button="update_cart")
+    cart = client.submit(form, "update_cart", {"quantities[3]": "2"})
+    cart.text_of(class_="error")
+
+Pages that only work with JavaScript (the +/- buttons on customer_home.php)
+stay in the Selenium tests.
+"""
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+
+from harness import impact, settings
+
+HTTP_TIMEOUT = 10
+SESSION_COOKIE = "PHPSESSID"
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+# ---------- HTML ----------
+class Element:
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []    # Elements and text strings, in document order
+
+    def __repr__(self):
+        return f"<{self.tag} {self.attrs}>"
+
+    @property
+    def text(self):
+        """Whitespace-normalised text content, like WebElement.text."""
+        parts = []
+        for child in self.children:
+            parts.append(child.text if isinstance(child, Element) else child)
+        return " ".join(" ".join(parts).split())
+
+    def iter(self):
+        for child in self.children:
+            if isinstance(child, Element):
+                yield child
+                yield from child.iter()
+
+    def find_all(self, tag=None, id=None, class_=None, name=None):
+        found = []
+        for element in self.iter():
+            if tag and element.tag != tag:
+                continue
+            if id and element.attrs.get("id") != id:
+                continue
+            if class_ and class_ not in (element.attrs.get("class") or "").split():
+                continue
+            if name and element.attrs.get("name") != name:
+                continue
+            found.append(element)
+        return found
+
+    def find(self, tag=None, id=None, class_=None, name=None):
+        found = self.find_all(tag, id, class_, name)
+        return found[0] if found else None
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = self.current = Element("#document", {})
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, {k: (v if v is not None else "") for k, v in attrs}, self.current)
+        self.current.children.append(element)
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.current = self.current.parent
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed tags: close up to the nearest matching open element
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(markup):
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.root
+
+
+class Form:
+    """A <form> as the browser would submit it."""
+
+    def __init__(self, element, page_url):
+        self.element = element
+        self.method = (element.attrs.get("method") or "get").lower()
+        self.action = urljoin(page_url, element.attrs.get("action") or "")
+        self.fields = {}     # successful controls: name -> value
+        self.buttons = {}    # submit buttons: name -> value
+        for control in element.iter():
+            name = control.attrs.get("name")
+            if not name:
+                continue
+            kind = control.attrs.get("type", "submit" if control.tag == "button" else "text")
+            if control.tag in ("button", "input") and kind == "submit":
+                self.buttons.setdefault(name, control.attrs.get("value", ""))
+            elif control.tag == "input":
+                if kind in ("button", "reset", "file"):
+                    continue
+                if kind in ("checkbox", "radio") and "checked" not in control.attrs:
+                    continue
+                self.fields[name] = control.attrs.get("value", "")
+            elif control.tag == "textarea":
+                self.fields[name] = control.text
+            elif control.tag == "select":
+                options = control.find_all("option")
+                chosen = [o for o in options if "selected" in o.attrs] or options[:1]
+                if chosen:
+                    self.fields[name] = chosen[0].attrs.get("value", chosen[0].text)
+
+    def values(self, button=None, data=None):
+        """Field values plus the clicked button, overridden by `data`."""
+        values = dict(self.fields)
+        if button is not None:
+            if button not in self.buttons:
+                raise LookupError(f"form {self.action} has no submit button {button!r}: {sorted(self.buttons)}")
+            values[button] = self.buttons[button]
+        values.update(data or {})
+        return values
+
+
+class Page:
+    """A fetched HTML page: final URL after redirects, status and parsed tree."""
+
+    def __init__(self, response):
+        self.response = response
+        self.url = response.url
+        self.status = response.status_code
+        self.html = response.text
+        self.root = parse_html(self.html)
+
+    def find(self, tag=None, id=None, class_=None, name=None):
+        return self.root.find(tag, id, class_, name)
+
+    def find_all(self, tag=None, id=None, class_=None, name=None):
+        return self.root.find_all(tag, id, class_, name)
+
+    def text_of(self, tag=None, id=None, class_=None, name=None):
+        """Text of the first matching element, "" when there is none."""
+        element = self.find(tag, id, class_, name)
+        return element.text if element is not None else ""
+
+    @property
+    def forms(self):
+        return [Form(element, self.url) for element in self.find_all("form")]
+
+    def form(self, button=None, field=None):
+        """First form with the given submit button and/or field name."""
+        for form in self.forms:
+            if button is not None and button not in form.buttons:
+                continue
+            if field is not None and field not in form.fields:
+                continue
+            return form
+        raise LookupError(f"no form with button={button!r} field={field!r} on {self.url}")
+
+
+# ---------- CLIENT ----------
+class ShopClient:
+    """One cookie jar, i.e. one PHP session, talking to the shop over HTTP."""
+
+    def __init__(self):
+        self.session = requests.Session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    @property
+    def session_id(self):
+        return self.session.cookies.get(SESSION_COOKIE)
+
+    def get(self, path, params=None):
+        response = self.session.get(settings.shop_url(path), params=params, timeout=HTTP_TIMEOUT)
+        impact.record_response(response)
+        return Page(response)
+
+    def submit(self, form, button=None, data=None):
+        """Submit `form` as if `button` was clicked, with `data` typed into its fields."""
+        values = form.values(button, data)
+        if form.method == "post":
+            response = self.session.post(form.action, data=values, timeout=HTTP_TIMEOUT)
+        else:
+            response = self.session.get(form.action, params=values, timeout=HTTP_TIMEOUT)
+        impact.record_response(response)
+        return Page(response)
+
+    def login(self, role, username, password):
+        """POST the index.php form and return the role's home page."""
+        page = self.get("index.php")
+        form = page.form(field="username")
+        button = next(iter(form.buttons), None)
+        home = self.submit(form, button, {"username": username, "password": password})
+        if settings.HOME_PAGES[role] not in home.url:
+            raise RuntimeError(f"HTTP login as {username!r} ended on {home.url}")
+        if not self.session_id:
+            raise RuntimeError(f"HTTP login as {username!r} returned no {SESSION_COOKIE} cookie")
+        return home
@@ -0,0 +1,260 @@
+"""Concurrent checkout against admin stock edits on one low-stock product.
+
+test_pay checks one purchase and TestUpdateStock one stock edit; this runs
+them at the same time. One product is seeded with little stock and every
+customer gets one cart line for it. All customers then press Pay Now on
+pay.php at once while admins keep restocking the product through
+update_stock.php (check the product, read "current stock", submit it plus
+--restock) - the read-modify-write the admin page invites.
+
+Afterwards products.stock is reconciled with the cart rows that were
+actually purchased (the seeded lines that are gone):
+
+    expected stock = initial + units restocked - units purchased
+
+    oversell      stock below zero, or more units purchased than ever existed
+    lost update   stock differs from the expected value, i.e. a purchase or
+                  a restock was overwritten by a concurrent write
+    unconfirmed   cart rows purchased without the customer seeing the
+                  confirmation, or confirmations with the row still there
+
+    cd tests
+    python -m harness.contention --standin --customers 30 --admins 3 --stock 10
+"""
+import argparse
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import settings
+from harness.client import ShopClient
+from harness.factory import DataFactory, ScenarioSpec
+
+STOCK_PAGE = "admin/update_stock.php"
+START_TIMEOUT = 60
+CURRENT_STOCK = re.compile(r"current stock:\s*(-?\d+)")
+
+
+# ---------- STATS ----------
+class ContentionStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)   # action -> seconds
+        self.outcomes = Counter()            # "bought", "out of stock", "restocked", "error", ...
+        self.confirmed = set()               # customer ids that saw "successfully bought"
+        self.restocked = 0                   # units added by confirmed admin updates
+        self.errors = []                     # first few error messages
+        self.started = self.finished = None
+        self._lock = threading.Lock()
+
+    def add(self, action, seconds, outcome):
+        with self._lock:
+            self.latencies[action].append(seconds)
+            self.outcomes[outcome] += 1
+
+    def error(self, action, exc):
+        with self._lock:
+            self.outcomes["error"] += 1
+            if len(self.errors) < 5:
+                self.errors.append(f"{action}: {type(exc).__name__}: {exc}")
+
+    @property
+    def elapsed(self):
+        return self.finished - self.started
+
+    def report(self):
+        payments = len(self.latencies.get("pay_now", []))
+        edits = len(self.latencies.get("update_stock", []))
+        requests = sum(len(values) for values in self.latencies.values())
+        lines = [
+            f"{payments} payments and {edits} stock edits in "
+            f"{self.elapsed:.2f}s = {payments / self.elapsed:.1f} payments/s, "
+            f"{requests / self.elapsed:.1f} contended requests/s",
+            f"outcomes: {dict(self.outcomes)}",
+        ]
+        for action, values in sorted(self.latencies.items()):
+            ms = sorted(value * 1000 for value in values)
+            pct = [ms[min(len(ms) - 1, int(p / 100 * len(ms)))] for p in (50, 95)]
+            lines.append(f"  {action:<14} {len(ms):5d}  p50 {pct[0]:7.1f}ms  p95 {pct[1]:7.1f}ms  "
+                         f"max {ms[-1]:7.1f}ms")
+        for message in self.errors:
+            lines.append(f"⚠️ {message}")
+        return lines
+
+
+# ---------- ACTORS ----------
+def _timed(call):
+    started = time.perf_counter()
+    page = call()
+    return page, time.perf_counter() - started
+
+
+def pay(client, customer, start, stats):
+    """Open pay.php, wait for everyone, then press Pay Now once."""
+    try:
+        page = client.get("customer/pay.php")
+        form = page.form(button="pay_now")
+    except Exception:
+        start.abort()    # release everyone now instead of after START_TIMEOUT
+        raise
+    start.wait(START_TIMEOUT)
+    try:
+        page, seconds = _timed(lambda: client.submit(form, "pay_now"))
+    except Exception as exc:
+        stats.error("pay_now", exc)
+        return
+    if "successfully bought" in page.text_of(class_="message").lower():
+        stats.confirmed.add(customer.id)
+        outcome = "bought"
+    elif "stock" in page.text_of(class_="error").lower():
+        outcome = "out of stock"
+    else:
+        outcome = f"pay_now HTTP {page.status}"
+    stats.add("pay_now", seconds, outcome)
+
+
+def restock(client, product, start, stats, rounds, units):
+    """Read the current stock on update_stock.php and write it back plus `units`."""
+    start.wait(START_TIMEOUT)
+    for _ in range(rounds):
+        try:
+            page = client.get(STOCK_PAGE)
+            page, seconds = _timed(lambda: client.submit(
+                page.form(field="product_id"), "check_product", {"product_id": str(product.id)}))
+            stats.add("check_product", seconds, "checked")
+            current = int(CURRENT_STOCK.search(page.text_of(class_="product-info")).group(1))
+            page, seconds = _timed(lambda: client.submit(
+                page.form(button="update_stock"), "update_stock", {"new_stock": str(current + units)}))
+        except Exception as exc:
+            stats.error("update_stock", exc)
+            continue
+        if "updated" in page.text_of(class_="success").lower():
+            with stats._lock:
+                stats.restocked += units
+            stats.add("update_stock", seconds, "restocked")
+        else:
+            stats.add("update_stock", seconds, f"update_stock HTTP {page.status}")
+
+
+# ---------- RUNNER ----------
+def _release(start, jobs):
+    """Start everyone together; an actor that failed first is raised as itself, not as a broken barrier."""
+    try:
+        start.wait(START_TIMEOUT)
+    except threading.BrokenBarrierError:
+        errors = [job.exception() for job in jobs]
+        cause = next((error for error in errors
+                      if error is not None and not isinstance(error, threading.BrokenBarrierError)), None)
+        raise RuntimeError(f"contention never started: {cause or 'an actor did not reach the start'}") from cause
+
+
+def run_contention(customers, admins, product, rounds, units):
+    """Log everyone in, release them together, return the ContentionStats."""
+    stats = ContentionStats()
+    start = threading.Barrier(len(customers) + len(admins) + 1)
+    clients = []
+    try:
+        for user in customers + admins:
+            client = ShopClient()
+            clients.append(client)
+            client.login(user.role, user.username, user.password)
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            jobs = [executor.submit(pay, client, customer, start, stats)
+                    for client, customer in zip(clients, customers)]
+            jobs += [executor.submit(restock, client, product, start, stats, rounds, units)
+                     for client in clients[len(customers):]]
+            _release(start, jobs)
+            stats.started = time.perf_counter()
+            for job in jobs:
+                job.result()
+            stats.finished = time.perf_counter()
+    finally:
+        for client in clients:
+            client.close()
+    return stats
+
+
+def verify(db, product, cart, stats):
+    """Oversell / lost update / confirmation problems; an empty list means none."""
+    problems = []
+    stock = db.query_one("SELECT stock FROM products WHERE id = %s", (product.id,))[0]
+    marks = ", ".join(["%s"] * len(cart))
+    open_ids = {row[0] for row in db.query(
+        f"SELECT id FROM cart WHERE id IN ({marks}) AND bought = 'no'", [line.id for line in cart])}
+    purchased = [line for line in cart if line.id not in open_ids]
+    units = sum(line.quantity for line in purchased)
+    available = product.stock + stats.restocked
+    expected = available - units
+
+    if stock < 0:
+        problems.append(f"oversell: stock is {stock}")
+    if units > available:
+        problems.append(f"oversell: {units} units purchased, only {available} ever in stock")
+    if stock != expected:
+        problems.append(f"lost update: stock is {stock}, expected {expected} "
+                        f"({product.stock} + {stats.restocked} restocked - {units} purchased)")
+    buyers = {line.user_id for line in purchased}
+    if buyers - stats.confirmed:
+        problems.append(f"unconfirmed: {len(buyers - stats.confirmed)} cart rows purchased without a confirmation")
+    if stats.confirmed - buyers:
+        problems.append(f"unconfirmed: {len(stats.confirmed - buyers)} confirmations with the cart row still open")
+    return problems
+
+
+def run(db, customers=20, admins=2, stock=5, quantity=1, rounds=3, restock_units=1):
+    """Seed the product, run the contention, verify, clean up; returns (stats, problems)."""
+    factory = DataFactory(db)
+    try:
+        scenario = factory.scenario(ScenarioSpec(customers=customers, products=1, cart_lines=1,
+                                                 quantity=quantity, stock=stock))
+        product = scenario.products[0]
+        editors = factory.users(admins, role="admin", prefix="stockadmin")
+        stats = run_contention(scenario.customers, editors, product, rounds, restock_units)
+        return stats, verify(db, product, scenario.cart, stats)
+    finally:
+        factory.cleanup()
+
+
+def main(argv=None):
+    from harness.db import SQLiteDatabase, get_db
+    from harness.standin import StandInShop
+
+    parser = argparse.ArgumentParser(prog="python -m harness.contention", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--standin", action="store_true", help="run against a fresh SQLite stand-in")
+    parser.add_argument("--customers", type=int, default=20, help="customers paying at the same moment")
+    parser.add_argument("--admins", type=int, default=2, help="admins editing the stock meanwhile")
+    parser.add_argument("--stock", type=int, default=5, help="initial stock of the contended product")
+    parser.add_argument("--quantity", type=int, default=1, help="units in each customer's cart line")
+    parser.add_argument("--rounds", type=int, default=3, help="stock edits per admin")
+    parser.add_argument("--restock", type=int, default=1, help="units each stock edit adds")
+    args = parser.parse_args(argv)
+
+    shop = None
+    if args.standin:
+        shop = StandInShop().start()
+        settings.BASE_URL = shop.base_url
+        db = SQLiteDatabase(shop.db_path)
+    else:
+        settings.BASE_URL = args.base_url
+        db = get_db()
+    try:
+        stats, problems = run(db, args.customers, args.admins, args.stock, args.quantity,
+                              args.rounds, args.restock)
+    finally:
+        db.close()
+        if shop is not None:
+            shop.stop()
+    print("\n".join(stats.report()))
+    if problems:
+        print("❌ stock and purchased cart rows disagree:")
+        print("\n".join(f"  {problem}" for problem in problems))
+        return 1
+    print("✅ no oversell or lost update")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+"""Database access for test oracles.
+
+All DB reads and writes made by the tests go through one Database object
+per session (the `db` fixture). It keeps a small pool of autocommit
+connections open for the whole run and, on each connection, one prepared
+cursor per distinct SQL string, so repeated oracle queries skip both the
+connection handshake and statement parsing.
+
+Queries are written for MySQL (%s placeholders, MD5()). When the suite runs
+against the SQLite stand-in (--standin) the same queries go to its database
+file through SQLiteDatabase.
+
+snapshot() / restore() put users, products and cart back the way they were
+(--db-restore in conftest.py calls them around each test). The PHP app
+writes through its own connections, so a savepoint on ours could not undo
+its changes: on MySQL each table is cloned into a _snapshot_<ns>_<table>
+copy instead (<ns> is workers.namespace(), so two runs sharing one server
+never overwrite or drop each other's copies), and CHECKSUM TABLE skips the copy - and the restore - for tables
+that did not change. The stand-in copies its whole file to memory and back
+with SQLite's backup API.
+"""
+import difflib
+import os
+import pprint
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+import pytest
+
+from harness import impact, workers
+from harness.standin import connect as sqlite_connect
+
+# ---------- DB CONFIG ----------
+DB_CONFIG = {
+    "host": os.environ.get("MINISHOP_DB_HOST", "localhost"),
+    "user": os.environ.get("MINISHOP_DB_USER", "root"),
+    "password": os.environ.get("MINISHOP_DB_PASSWORD", ""),
+    "database": os.environ.get("MINISHOP_DB_NAME", "mini_shop"),
+}
+POOL_SIZE = int(os.environ.get("MINISHOP_DB_POOL", "4"))
+SQLITE_PATH = os.environ.get("MINISHOP_SQLITE")   # set: use this SQLite file instead of MySQL
+
+SNAPSHOT_TABLES = ("users", "products", "cart")
+SNAPSHOT_PREFIX = "_snapshot_"
+
+POOL_TIMEOUT = 30   # seconds to wait for a free connection before giving up
+WAIT_TIMEOUT = 10
+FIRST_POLL = 0.05   # seconds before the second look, doubled up to MAX_POLL
+MAX_POLL = 0.5
+
+CART_ITEMS_SQL = """
+    SELECT c.product_id, c.quantity, p.name, p.price
+    FROM cart c
+    JOIN products p ON c.product_id = p.id
+    WHERE c.user_id = %s AND c.bought = 'no'
+"""
+
+
+class _PooledConnection:
+    def __init__(self, raw):
+        self.raw = raw
+        self.statements = {}   # sql -> prepared cursor
+
+    def cursor(self, sql):
+        cursor = self.statements.get(sql)
+        if cursor is None:
+            cursor = self.statements[sql] = self.raw.cursor(prepared=True)
+        return cursor
+
+    def plain_cursor(self):
+        return self.raw.cursor()
+
+    def begin(self):
+        self.raw.start_transaction()
+
+    def close(self):
+        for cursor in self.statements.values():
+            cursor.close()
+        self.raw.close()
+
+
+class _QmarkCursor:
+    """sqlite3 cursor that accepts the MySQL-style %s placeholders."""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def execute(self, sql, params=()):
+        self.raw.execute(sql.replace("%s", "?"), tuple(params))
+
+    def executemany(self, sql, seq_of_params):
+        self.raw.executemany(sql.replace("%s", "?"), seq_of_params)
+
+    def fetchall(self):
+        return self.raw.fetchall()
+
+    def fetchone(self):
+        return self.raw.fetchone()
+
+    @property
+    def rowcount(self):
+        return self.raw.rowcount
+
+    def close(self):
+        self.raw.close()
+
+
+class _SQLiteConnection(_PooledConnection):
+    # sqlite3 keeps its own compiled-statement cache, so no prepared cursors here
+    def cursor(self, sql):
+        return _QmarkCursor(self.raw.cursor())
+
+    def plain_cursor(self):
+        return _QmarkCursor(self.raw.cursor())
+
+    def begin(self):
+        self.raw.execute("BEGIN")
+
+
+class Database:
+    """Fixed-size pool of autocommit MySQL connections with cached prepared statements."""
+
+    # The connection itself is gone (server restart, "lost connection"): close it, do not pool it
+    BROKEN = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)
+
+    def __init__(self, config=None, size=POOL_SIZE):
+        self.config = dict(config or DB_CONFIG)
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._snapshot = {}    # table -> checksum of its _snapshot_ copy
+
+    # ---------- POOL ----------
+    def _open(self):
+        # autocommit so every SELECT sees rows the app committed after we connected
+        return _PooledConnection(mysql.connector.connect(autocommit=True, **self.config))
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._opened < self.size
+                if grow:
+                    self._opened += 1
+            if grow:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=POOL_TIMEOUT)
+                except queue.Empty:
+                    raise RuntimeError(f"no DB connection came free in {POOL_TIMEOUT}s: all {self.size} "
+                                       f"are in use (nested connection() calls?)") from None
+        broken = False
+        try:
+            yield conn
+        except self.BROKEN:
+            broken = True
+            raise
+        except BaseException:
+            # IntegrityError, a bad statement, a failed transaction: the connection is still fine
+            broken = not self._rollback(conn)
+            raise
+        finally:
+            if broken:
+                # The next caller opens a fresh one
+                with self._lock:
+                    self._opened -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            else:
+                self._idle.put(conn)
+
+    @staticmethod
+    def _rollback(conn):
+        """Undo whatever the failed block left open; False if the connection cannot even do that."""
+        try:
+            conn.raw.rollback()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    # ---------- QUERIES ----------
+    def query(self, sql, params=()):
+        """All rows of a SELECT as a list of tuples."""
+        impact.record_sql(sql)
+        with self.connection() as conn:
+            cursor = conn.cursor(sql)
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def query_one(self, sql, params=()):
+        rows = self.query(sql, params)
+        return rows[0] if rows else None
+
+    def execute(self, sql, params=()):
+        """Run a write statement (autocommitted) and return the affected row count."""
+        impact.record_sql(sql)
+        with self.connection() as conn:
+            cursor = conn.cursor(sql)
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    @contextmanager
+    def transaction(self):
+        """Plain (non-prepared) cursor inside START TRANSACTION ... COMMIT.
+
+        Meant for bulk writes: executemany on this cursor is sent as one
+        multi-row INSERT, and nothing is visible to the app until commit.
+        """
+        with self.connection() as conn:
+            conn.begin()
+            cursor = conn.plain_cursor()
+            try:
+                yield cursor
+                conn.raw.commit()
+            except Exception:
+                conn.raw.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    # ---------- SNAPSHOTS ----------
+    @staticmethod
+    def _copy(table):
+        return f"{SNAPSHOT_PREFIX}{workers.namespace()}_{table}"
+
+    @staticmethod
+    def _checksum(cur, table):
+        cur.execute(f"CHECKSUM TABLE {table}")
+        return cur.fetchone()[1]
+
+    def snapshot(self, tables=SNAPSHOT_TABLES):
+        """Remember the current rows of `tables`; copies only tables that changed since the last one."""
+        with self.connection() as conn:
+            cur = conn.plain_cursor()
+            try:
+                for table in tables:
+                    checksum = self._checksum(cur, table)
+                    if self._snapshot.get(table) == checksum:
+                        continue
+                    copy = self._copy(table)
+                    cur.execute(f"CREATE TABLE IF NOT EXISTS {copy} LIKE {table}")
+                    cur.execute(f"DELETE FROM {copy}")
+                    cur.execute(f"INSERT INTO {copy} SELECT * FROM {table}")
+                    self._snapshot[table] = checksum
+            finally:
+                cur.close()
+
+    def restore(self):
+        """Put back the rows of every snapshotted table that changed; returns those tables."""
+        with self.connection() as conn:
+            cur = conn.plain_cursor()
+            try:
+                changed = [table for table, checksum in self._snapshot.items()
+                           if self._checksum(cur, table) != checksum]
+                if not changed:
+                    return []
+                cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+                conn.begin()
+                try:
+                    for table in changed:
+                        cur.execute(f"DELETE FROM {table}")
+                        cur.execute(f"INSERT INTO {table} SELECT * FROM {self._copy(table)}")
+                    conn.raw.commit()
+                except Exception:
+                    conn.raw.rollback()
+                    raise
+                finally:
+                    cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+                return changed
+            finally:
+                cur.close()
+
+    def drop_snapshot(self):
+        with self.connection() as conn:
+            cur = conn.plain_cursor()
+            try:
+                for table in set(SNAPSHOT_TABLES) | set(self._snapshot):
+                    cur.execute(f"DROP TABLE IF EXISTS {self._copy(table)}")
+            finally:
+                cur.close()
+        self._snapshot = {}
+
+    def wait_for(self, query, params, predicate, timeout=WAIT_TIMEOUT):
+        """Poll `query` until predicate(rows) is true and return those rows.
+
+        Replaces "sleep a few seconds, then query": the test continues as soon
+        as the app has written what we expect. On timeout the AssertionError
+        shows the rows seen on the first and the last poll, so it is obvious
+        whether the app wrote nothing at all or wrote something different.
+        """
+        deadline = time.monotonic() + timeout
+        delay = FIRST_POLL
+        first = None
+        while True:
+            rows = self.query(query, params)
+            if first is None:
+                first = rows
+            if predicate(rows):
+                return rows
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, MAX_POLL)
+
+        diff = "\n".join(difflib.unified_diff(
+            pprint.pformat(first).splitlines(), pprint.pformat(rows).splitlines(),
+            "first poll", "last poll", lineterm="",
+        )) or f"rows never changed: {rows!r}"
+        raise AssertionError(
+            f"⚠️ DB did not reach the expected state within {timeout}s\n"
+            f"query: {' '.join(query.split())}\nparams: {params!r}\n{diff}"
+        )
+
+    # ---------- SHOP HELPERS ----------
+    def get_user_id(self, username):
+        row = self.query_one("SELECT id FROM users WHERE username = %s", (username,))
+        return row[0] if row else None
+
+    def get_product_id_by_name(self, name):
+        row = self.query_one("SELECT id FROM products WHERE name = %s", (name,))
+        return row[0] if row else None
+
+    def get_cart_items(self, user_id):
+        """Unbought cart lines as (product_id, quantity, name, price)."""
+        return self.query(CART_ITEMS_SQL, (user_id,))
+
+    def seed_cart_if_empty(self, user_id):
+        """Ensure the cart has at least one product for testing."""
+        if self.get_cart_items(user_id):
+            return
+        product = self.query_one("SELECT id, stock FROM products WHERE stock > 0 LIMIT 1")
+        if not product:
+            pytest.skip("⚠️ No products in stock to seed cart.")
+        self.execute(
+            "INSERT INTO cart (user_id, product_id, quantity, bought) VALUES (%s, %s, %s, 'no')",
+            (user_id, product[0], 1),
+        )
+        print(f"🛒 Seeded product {product[0]} for user {user_id}")
+
+    def create_user(self, username, password, role="customer"):
+        self.execute(
+            "INSERT INTO users (username, password, role) VALUES (%s, MD5(%s), %s)",
+            (username, password, role),
+        )
+
+    def delete_user(self, username):
+        self.execute("DELETE FROM users WHERE username = %s", (username,))
+
+    def delete_product(self, name):
+        self.execute("DELETE FROM cart WHERE product_id IN (SELECT id FROM products WHERE name = %s)", (name,))
+        self.execute("DELETE FROM products WHERE name = %s", (name,))
+
+
+class SQLiteDatabase(Database):
+    """Same API on top of a SQLite file, e.g. the stand-in shop's database."""
+
+    # sqlite3.OperationalError is mostly "database is locked" or bad SQL, not a dead connection
+    BROKEN = (sqlite3.InterfaceError,)
+
+    def __init__(self, path, size=POOL_SIZE):
+        super().__init__(config={"database": path}, size=size)
+        self.path = path
+
+    def _open(self):
+        return _SQLiteConnection(sqlite_connect(self.path))
+
+    # The stand-in's file holds nothing but the shop tables: back up and restore all of it
+    def snapshot(self, tables=SNAPSHOT_TABLES):
+        copy = sqlite3.connect(":memory:", check_same_thread=False)
+        with self.connection() as conn:
+            conn.raw.backup(copy)
+        previous, self._snapshot = self._snapshot, {"copy": copy}
+        if previous:
+            previous["copy"].close()
+
+    def restore(self):
+        if not self._snapshot:
+            return []
+        with self.connection() as conn:
+            self._snapshot["copy"].backup(conn.raw)
+        return list(SNAPSHOT_TABLES)
+
+    def drop_snapshot(self):
+        if self._snapshot:
+            self._snapshot["copy"].close()
+        self._snapshot = {}
+
+
+# ---------- SESSION POOL ----------
+_shared = None
+
+
+def get_db():
+    """The session's Database, created on first use (the `db` fixture returns the same one)."""
+    global _shared
+    if _shared is None:
+        _shared = SQLiteDatabase(SQLITE_PATH) if SQLITE_PATH else Database()
+    return _shared
+
+
+def close_db():
+    global _shared
+    if _shared is not None:
+        _shared.close()
+        _shared = None
+
+
+def wait_for_db(query, params, predicate, timeout=WAIT_TIMEOUT):
+    """Module-level shortcut for get_db().wait_for(...)."""
+    return get_db().wait_for(query, params, predicate, timeout)
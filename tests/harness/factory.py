@@ -0,0 +1,195 @@
+"""Bulk creation of users, products and cart lines straight in the DB.
+
+Typing a product into add_product.php costs seconds; inserting fifty rows
+with one executemany costs milliseconds. Every create call runs inside a
+single transaction and hands back typed, immutable handles. Everything a
+factory created is deleted again by cleanup() (the `factory` fixture calls
+it at the end of the session).
+
+    factory.product(stock=20)
+    factory.products(50, price=99)
+    factory.scenario("customer_with_50_line_cart")
+    factory.scenario(ScenarioSpec(products=3, cart_lines=3, quantity=2))
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from harness.workers import unique_name
+
+DEFAULT_PASSWORD = "Test123"
+
+
+@dataclass(frozen=True)
+class User:
+    id: int
+    username: str
+    password: str    # plain text, for logging in; the DB stores MD5
+    role: str
+
+
+@dataclass(frozen=True)
+class Product:
+    id: int
+    name: str
+    price: int
+    stock: int
+
+
+@dataclass(frozen=True)
+class CartLine:
+    id: int
+    user_id: int
+    product_id: int
+    quantity: int
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    """Declarative description of a data set; all counts may be zero."""
+    customers: int = 1
+    products: int = 0
+    cart_lines: int = 0      # per customer, taken from the scenario's products
+    quantity: int = 1
+    price: int = 100
+    stock: int = 10
+
+
+@dataclass(frozen=True)
+class Scenario:
+    customers: list
+    products: list
+    cart: list = field(default_factory=list)
+
+    @property
+    def customer(self):
+        return self.customers[0]
+
+
+SCENARIOS = {
+    "customer": ScenarioSpec(),
+    "customer_with_cart": ScenarioSpec(products=1, cart_lines=1),
+    "customer_with_50_line_cart": ScenarioSpec(products=50, cart_lines=50),
+    "low_stock_product": ScenarioSpec(customers=0, products=1, stock=1),
+}
+
+
+class DataFactory:
+    def __init__(self, db):
+        self.db = db
+        self.user_ids = []
+        self.product_ids = []
+        self.cart_ids = []
+
+    # ---------- PUBLIC API ----------
+    def users(self, count, role="customer", password=DEFAULT_PASSWORD, prefix="user"):
+        with self._transaction() as (cur, created):
+            users = self._insert_users(cur, created, count, role, password, prefix)
+        return users
+
+    def user(self, **kwargs):
+        return self.users(1, **kwargs)[0]
+
+    def products(self, count, price=100, stock=10, prefix="Product"):
+        with self._transaction() as (cur, created):
+            products = self._insert_products(cur, created, count, price, stock, prefix)
+        return products
+
+    def product(self, **kwargs):
+        return self.products(1, **kwargs)[0]
+
+    def cart(self, user, products, quantity=1):
+        with self._transaction() as (cur, created):
+            lines = self._insert_cart(cur, created, user, products, quantity)
+        return lines
+
+    def scenario(self, spec):
+        """Build a ScenarioSpec (or the name of one in SCENARIOS) in one transaction."""
+        if isinstance(spec, str):
+            spec = SCENARIOS[spec]
+        if spec.cart_lines > spec.products:
+            raise ValueError(f"{spec}: cart_lines cannot exceed products")
+        with self._transaction() as (cur, created):
+            customers = self._insert_users(cur, created, spec.customers, "customer", DEFAULT_PASSWORD, "cust")
+            products = self._insert_products(cur, created, spec.products, spec.price, spec.stock, "Product")
+            cart = []
+            for customer in customers:
+                cart += self._insert_cart(cur, created, customer, products[:spec.cart_lines], spec.quantity)
+        return Scenario(customers, products, cart)
+
+    def cleanup(self):
+        """Delete every row this factory created, plus cart lines pointing at them."""
+        if not (self.user_ids or self.product_ids or self.cart_ids):
+            return
+        with self.db.transaction() as cur:
+            if self.cart_ids:
+                cur.executemany("DELETE FROM cart WHERE id = %s", [(i,) for i in self.cart_ids])
+            if self.user_ids:
+                cur.executemany("DELETE FROM cart WHERE user_id = %s", [(i,) for i in self.user_ids])
+                cur.executemany("DELETE FROM users WHERE id = %s", [(i,) for i in self.user_ids])
+            if self.product_ids:
+                cur.executemany("DELETE FROM cart WHERE product_id = %s", [(i,) for i in self.product_ids])
+                cur.executemany("DELETE FROM products WHERE id = %s", [(i,) for i in self.product_ids])
+        self.user_ids, self.product_ids, self.cart_ids = [], [], []
+
+    # ---------- INSERTS (caller owns the transaction) ----------
+    @contextmanager
+    def _transaction(self):
+        """db.transaction() plus the ids it created, kept for cleanup() only once it has committed."""
+        created = {"users": [], "products": [], "cart": []}
+        with self.db.transaction() as cur:
+            yield cur, created
+        # A rollback never gets here: those ids never existed, or belong to someone else by now
+        self.user_ids += created["users"]
+        self.product_ids += created["products"]
+        self.cart_ids += created["cart"]
+
+    def _insert_users(self, cur, created, count, role, password, prefix):
+        if count <= 0:
+            return []
+        names = [unique_name(prefix) for _ in range(count)]
+        cur.executemany(
+            "INSERT INTO users (username, password, role) VALUES (%s, MD5(%s), %s)",
+            [(name, password, role) for name in names],
+        )
+        ids = self._ids_by(cur, "users", "username", names)
+        created["users"] += ids
+        return [User(i, name, password, role) for i, name in zip(ids, names)]
+
+    def _insert_products(self, cur, created, count, price, stock, prefix):
+        if count <= 0:
+            return []
+        names = [unique_name(prefix) for _ in range(count)]
+        cur.executemany(
+            "INSERT INTO products (name, price, stock) VALUES (%s, %s, %s)",
+            [(name, price, stock) for name in names],
+        )
+        ids = self._ids_by(cur, "products", "name", names)
+        created["products"] += ids
+        return [Product(i, name, price, stock) for i, name in zip(ids, names)]
+
+    def _insert_cart(self, cur, created, user, products, quantity):
+        if not products:
+            return []
+        product_ids = [product.id for product in products]
+        cur.executemany(
+            "INSERT INTO cart (user_id, product_id, quantity, bought) VALUES (%s, %s, %s, 'no')",
+            [(user.id, product_id, quantity) for product_id in product_ids],
+        )
+        marks = ", ".join(["%s"] * len(product_ids))
+        cur.execute(
+            f"SELECT id, product_id FROM cart WHERE user_id = %s AND bought = 'no' "
+            f"AND product_id IN ({marks})",
+            [user.id] + product_ids,
+        )
+        line_ids = dict((product_id, line_id) for line_id, product_id in cur.fetchall())
+        created["cart"] += [line_ids[product_id] for product_id in product_ids]
+        return [CartLine(line_ids[product_id], user.id, product_id, quantity)
+                for product_id in product_ids]
+
+    @staticmethod
+    def _ids_by(cur, table, column, values):
+        # Multi-row INSERTs don't report every id, but unique_name() names are unique
+        marks = ", ".join(["%s"] * len(values))
+        cur.execute(f"SELECT {column}, id FROM {table} WHERE {column} IN ({marks})", list(values))
+        ids = dict(cur.fetchall())
+        return [ids[value] for value in values]
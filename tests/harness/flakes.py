@@ -0,0 +1,169 @@
+"""Pass/fail history of every test across runs, to tell flaky from broken.
+
+Each attempt of each test - setup, call and teardown together - is stored
+in a local SQLite file (--flake-history) with its outcome and duration. A
+test's flakiness score is how often its outcome flipped over its last
+WINDOW attempts:
+
+    score = flips / (attempts - 1)
+
+    PPPPPPPPPFPPPPPPPPPP   fails now and then    -> 2/19 = 0.11, flaky
+    PPPPPPPPPPFFFFFFFFFF   broke and stays broken -> 1/19 = 0.05
+    FFFFFFFFFFFFFFFFFFFF   always failing         -> 0
+
+A test with at least MIN_RUNS attempts and a score of --flake-threshold or
+more is known-flaky. When a known-flaky test fails, conftest.py reports it
+as RERUN instead and runs it again once every other test has finished, with
+all session fixtures torn down first - so in fresh browsers, with fresh
+logins and data. Under pytest-xdist a worker runs only what the controller
+hands it, so there are no reruns: a failure there is reported as is. The
+summary then lists
+
+    flaky     failed, then passed on the rerun
+    broken    failed and was not rescued by a rerun (not known-flaky, or
+              failed again)
+
+    pytest --flake-history .flake-history.sqlite --flake-reruns 1
+"""
+import os
+import sqlite3
+import time
+from collections import defaultdict
+
+from harness import workers
+
+WINDOW = 20          # attempts the score looks back over
+MIN_RUNS = 5         # fewer attempts than this: not enough history to call a test flaky
+THRESHOLD = 0.1
+KEEP = 200           # attempts kept per test, older ones are pruned
+
+history = None       # the run's FlakeHistory, set up by conftest.py
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    run TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_nodeid ON attempts (nodeid, id);
+"""
+
+RECENT_SQL = """
+SELECT nodeid, passed, duration FROM (
+    SELECT id, nodeid, passed, duration, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY id DESC) AS age
+    FROM attempts)
+WHERE age <= ? ORDER BY nodeid, id
+"""
+
+PRUNE_SQL = """
+DELETE FROM attempts WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY id DESC) AS age FROM attempts)
+    WHERE age > ?)
+"""
+
+
+def flip_rate(outcomes):
+    """Share of consecutive attempts whose outcome differs; 0.0 for fewer than two."""
+    if len(outcomes) < 2:
+        return 0.0
+    flips = sum(1 for before, after in zip(outcomes, outcomes[1:]) if before != after)
+    return flips / (len(outcomes) - 1)
+
+
+class FlakeHistory:
+    def __init__(self, path, threshold=THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.outcomes = defaultdict(list)    # nodeid -> [passed, ...] over the last WINDOW attempts, oldest first
+        self.durations = defaultdict(list)   # nodeid -> [seconds, ...], same attempts
+        self.run = defaultdict(list)         # nodeid -> [passed, ...] for the attempts of this run
+        self._pending = []                   # attempts not written yet
+        self._current = {}                   # nodeid -> {"failed", "skipped", "duration"} of the running attempt
+        if os.path.exists(path):
+            self._load()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _load(self):
+        conn = self._connect()
+        try:
+            for nodeid, passed, duration in conn.execute(RECENT_SQL, (WINDOW,)):
+                self.outcomes[nodeid].append(bool(passed))
+                self.durations[nodeid].append(duration)
+        finally:
+            conn.close()
+
+    # ---------- SCORES ----------
+    def score(self, nodeid):
+        return flip_rate(self.outcomes.get(nodeid, []))
+
+    def is_flaky(self, nodeid):
+        return len(self.outcomes.get(nodeid, [])) >= MIN_RUNS and self.score(nodeid) >= self.threshold
+
+    def mean_duration(self, nodeid):
+        durations = self.durations.get(nodeid)
+        return sum(durations) / len(durations) if durations else None
+
+    # ---------- RECORDING ----------
+    def add_report(self, report):
+        """Fold one setup/call/teardown report in; the teardown report closes the attempt."""
+        current = self._current.setdefault(report.nodeid, {"failed": False, "skipped": False, "duration": 0.0})
+        current["duration"] += report.duration
+        # A deferred failure ("rerun") is a failed attempt too
+        current["failed"] |= report.failed or report.outcome == "rerun"
+        current["skipped"] |= report.skipped
+        if report.when != "teardown":
+            return
+        del self._current[report.nodeid]
+        if current["skipped"] and not current["failed"]:
+            return    # skipped or xfailed: says nothing about flakiness
+        passed = not current["failed"]
+        self.run[report.nodeid].append(passed)
+        self._pending.append((workers.RUN_TOKEN, report.nodeid, getattr(report, "minishop_attempt", 1),
+                              int(passed), current["duration"], time.time()))
+
+    def save(self):
+        """Write this run's attempts and prune each test to its last KEEP attempts."""
+        if not self._pending:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("INSERT INTO attempts (run, nodeid, attempt, passed, duration, finished) "
+                                 "VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+                conn.execute(PRUNE_SQL, (KEEP,))
+        finally:
+            conn.close()
+        self._pending = []
+
+    # ---------- THIS RUN ----------
+    def classify(self):
+        """(flaky, broken) nodeids of this run: rescued by a rerun, or failed in the end."""
+        flaky, broken = [], []
+        for nodeid, attempts in self.run.items():
+            if all(attempts):
+                continue
+            (flaky if attempts[-1] else broken).append(nodeid)
+        return flaky, broken
+
+    def report(self):
+        flaky, broken = self.classify()
+        lines = []
+        for title, nodeids in (("flaky (passed on rerun)", flaky), ("broken", broken)):
+            if not nodeids:
+                continue
+            lines.append(f"{title}: {len(nodeids)}")
+            for nodeid in nodeids:
+                attempts = "".join("P" if passed else "F" for passed in self.run[nodeid])
+                known = "known-flaky, " if self.is_flaky(nodeid) else ""
+                lines.append(f"  {nodeid}  [{attempts}]  {known}score {self.score(nodeid):.2f} "
+                             f"over {len(self.outcomes.get(nodeid, []))} earlier attempts")
+        return lines
@@ -0,0 +1,222 @@
+"""Which minishop pages and DB tables each test touches, for change-based runs.
+
+While a test runs, every URL the shop serves to it is recorded - pages a
+browser navigated to (read from the tab's navigation history, so clicks and
+redirects count too) and responses a ShopClient received - together with
+the tables named in the SQL of its DB oracles. conftest.py stores this per
+test in the pytest cache ("minishop/touch-map") with the test file's hash,
+a fingerprint of every page it hit and whether it passed.
+
+Next run, the map answers two questions:
+
+    pytest --changed admin/update_stock.php,table:products
+        only tests that hit update_stock.php or query `products` run
+
+    pytest --skip-unchanged [--app-root ../minishop]
+        tests that passed last time, whose test file and pages are
+        unchanged since, are skipped
+
+A page's fingerprint is the hash of its PHP file under --app-root when that
+is given, otherwise the ETag (or Last-Modified, or a hash of the body) the
+server returns for it. Dynamic pages change their body with the data, so
+--app-root gives far more skips. Over HTTP the fingerprint is fetched
+logged out, so a protected page that redirects to the login form has no
+fingerprint (None): tests touching it are never skipped.
+
+Changes the map cannot place - a PHP include no test ever requested, or a
+test that has never been recorded - select the tests conservatively.
+"""
+import hashlib
+import os
+import re
+import threading
+from urllib.parse import urlsplit
+
+import requests
+
+from harness import settings
+
+CACHE_KEY = "minishop/touch-map"
+FETCH_TIMEOUT = 10
+
+TABLE_RE = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)`?", re.IGNORECASE)
+
+_lock = threading.Lock()
+_pages = set()
+_tables = set()
+_history = {}    # id(driver) -> highest navigation entry id already recorded
+results = {}     # nodeid -> {"ran", "passed", "pages", "tables"} for this run
+
+
+# ---------- RECORDING ----------
+def page_of(url):
+    """"customer/cart.php" for a URL of the shop under test; None for anything else."""
+    base = urlsplit(settings.BASE_URL)
+    parts = urlsplit(url)
+    prefix = base.path.rstrip("/") + "/"
+    if parts.netloc != base.netloc or not parts.path.startswith(prefix):
+        return None
+    return parts.path[len(prefix):] or "index.php"
+
+
+def begin_test():
+    with _lock:
+        _pages.clear()
+        _tables.clear()
+
+
+def end_test():
+    """{"pages": [...], "tables": [...]} touched since begin_test()."""
+    with _lock:
+        return {"pages": sorted(_pages), "tables": sorted(_tables)}
+
+
+def record_url(url):
+    page = page_of(url)
+    if page:
+        with _lock:
+            _pages.add(page)
+
+
+def record_response(response):
+    """A requests.Response, including every redirect that led to it."""
+    for hop in list(response.history) + [response]:
+        record_url(hop.url)
+
+
+def record_sql(sql):
+    tables = {table.lower() for table in TABLE_RE.findall(sql)}
+    with _lock:
+        _tables.update(tables)
+
+
+def record_driver(driver):
+    """Pages the tab visited since the last call for this driver."""
+    try:
+        history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+    except Exception:
+        try:
+            record_url(driver.current_url)    # no CDP (or a dead browser): the current page at least
+        except Exception:
+            pass
+        return
+    seen = _history.get(id(driver), -1)
+    for entry in history["entries"]:
+        if entry["id"] > seen:
+            record_url(entry["url"])
+    _history[id(driver)] = max([seen] + [entry["id"] for entry in history["entries"]])
+
+
+def add_report(report):
+    """Fold one setup/call/teardown report into `results`."""
+    result = results.setdefault(report.nodeid, {"ran": False, "passed": True, "pages": [], "tables": []})
+    if report.failed:
+        result["passed"] = False
+    if report.when == "call":
+        result["ran"] = not report.skipped
+    touched = getattr(report, "minishop_touch", None)    # set on the teardown report, survives xdist
+    if touched:
+        result.update(touched)
+
+
+# ---------- FINGERPRINTS ----------
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def page_fingerprint(page, app_root=None, session=None):
+    """Stable-as-possible identity of a page's current version; None when it cannot be seen."""
+    if app_root:
+        path = os.path.join(app_root, page)
+        return file_hash(path) if os.path.isfile(path) else "missing"
+    try:
+        response = (session or requests).get(settings.shop_url(page), timeout=FETCH_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if page_of(response.url) != page:
+        return None    # redirected, e.g. a protected page to the login form: that says nothing about this page
+    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+    return validator or hashlib.sha256(response.content).hexdigest()
+
+
+class Fingerprints:
+    """page -> fingerprint, each computed at most once per run."""
+
+    def __init__(self, app_root=None):
+        self.app_root = app_root
+        self.session = requests.Session()
+        self._known = {}
+
+    def __getitem__(self, page):
+        if page not in self._known:
+            self._known[page] = page_fingerprint(page, self.app_root, self.session)
+        return self._known[page]
+
+    def of(self, pages):
+        return {page: self[page] for page in pages}
+
+    def close(self):
+        self.session.close()
+
+
+# ---------- THE MAP ----------
+def update_map(touch_map, rootdir, fingerprints):
+    """Replace the entries of every test that actually ran in this session."""
+    for nodeid, result in results.items():
+        if not result["ran"]:
+            continue    # skipped or deselected: keep what the last real run recorded
+        path = os.path.join(rootdir, nodeid.split("::")[0])
+        touch_map[nodeid] = {
+            "pages": result["pages"],
+            "tables": result["tables"],
+            "passed": result["passed"],
+            "test_hash": file_hash(path) if os.path.isfile(path) else None,
+            "fingerprints": fingerprints.of(result["pages"]),
+        }
+    return touch_map
+
+
+# ---------- SELECTING ----------
+def normalise_change(change):
+    """"table:products" stays as is; file paths become page paths relative to the app."""
+    change = change.strip().replace("\\", "/")
+    if change.startswith("table:"):
+        return change.lower()
+    return change.lstrip("./")
+
+
+def _matches(change, page):
+    # "minishop/admin/update_stock.php" and "update_stock.php" both name "admin/update_stock.php"
+    return change == page or change.endswith("/" + page) or page.endswith("/" + change)
+
+
+def affected(entry, changes):
+    """True when a recorded test touched one of the changes (or might have)."""
+    if not entry or not (entry["pages"] or entry["tables"]):
+        return True    # never recorded, or reached the shop some way we cannot see: no grounds to skip it
+    for change in changes:
+        if change.startswith("table:"):
+            if change[len("table:"):] in entry["tables"]:
+                return True
+        elif any(_matches(change, page) for page in entry["pages"]):
+            return True
+    return False
+
+
+def unplaced(changes, touch_map):
+    """Changed files no recorded test ever requested (includes, shared code, assets)."""
+    known = {page for entry in touch_map.values() for page in entry["pages"]}
+    return [change for change in changes
+            if not change.startswith("table:")
+            and not any(_matches(change, page) for page in known)]
+
+
+def unchanged(entry, test_hash, fingerprints):
+    """True when the test passed last time and neither it nor its pages changed since."""
+    if not entry or not entry.get("passed") or entry.get("test_hash") != test_hash:
+        return False
+    if not (entry["pages"] or entry["tables"]):
+        return False    # nothing recorded, so nothing to compare
+    return all(value is not None and fingerprints[page] == value
+               for page, value in entry.get("fingerprints", {}).items())
@@ -0,0 +1,295 @@
+"""Asynchronous HTTP load generator built from the customer journey.
+
+Each virtual customer walks the same flow the functional tests cover -
+log in, browse, search, add to cart, update the quantity, pay, log out -
+over plain HTTP with its own cookie jar. Journeys arrive as a Poisson
+process at --rate per second for --duration seconds; at most --users of
+them run at once (one per load account, so a cart is never shared).
+
+Accounts and products are created for the run with DataFactory and
+deleted afterwards. Because nothing else touches those products, the run
+ends with an exact consistency check: for every product, stock before
+minus stock after must equal the units the shop confirmed as bought, no
+stock may be negative and no cart row may be left with a bad quantity.
+
+    cd tests
+    python -m harness.load --standin --users 20 --rate 10 --duration 30
+    python -m harness.load --base-url http://shop.local/minishop --users 50 --rate 25
+
+Needs aiohttp (pip install aiohttp).
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+import aiohttp
+
+from harness import settings
+from harness.client import Form, parse_html
+from harness.factory import DEFAULT_PASSWORD, DataFactory
+
+REQUEST_TIMEOUT = 30
+
+
+# ---------- STATS ----------
+class LoadStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)   # endpoint -> seconds
+        self.errors = Counter()              # endpoint -> failed requests
+        self.journeys = Counter()            # "completed", "failed", "out of stock"
+        self.bought = Counter()              # product_id -> units the shop confirmed
+        self.failures = []                   # first few error messages
+        self.started = self.finished = None
+
+    def add(self, endpoint, seconds, ok=True):
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def report(self):
+        requests = sum(len(values) for values in self.latencies.values())
+        lines = [
+            f"{requests} requests in {self.elapsed:.1f}s = {requests / self.elapsed:.1f} req/s; "
+            f"journeys: {dict(self.journeys)}",
+            f"{'endpoint':<36} {'count':>6} {'req/s':>7} {'errors':>6} "
+            f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}",
+        ]
+        for endpoint, values in sorted(self.latencies.items()):
+            ms = sorted(value * 1000 for value in values)
+            pct = [ms[min(len(ms) - 1, int(p / 100 * len(ms)))] for p in (50, 90, 99)]
+            lines.append(f"{endpoint:<36} {len(ms):6d} {len(ms) / self.elapsed:7.1f} "
+                         f"{self.errors[endpoint]:6d} {pct[0]:6.1f}ms {pct[1]:6.1f}ms "
+                         f"{pct[2]:6.1f}ms {ms[-1]:6.1f}ms")
+        for message in self.failures:
+            lines.append(f"⚠️ {message}")
+        return lines
+
+
+# ---------- JOURNEY ----------
+class JourneyError(Exception):
+    pass
+
+
+class VirtualCustomer:
+    """One cookie jar walking the customer journey once per call to run()."""
+
+    def __init__(self, account, products, stats, rng):
+        self.account = account
+        self.products = {product.id: product for product in products}
+        self.stats = stats
+        self.rng = rng
+
+    async def _request(self, session, endpoint, method, path_or_url, data=None, params=None):
+        url = path_or_url if "://" in path_or_url else settings.shop_url(path_or_url)
+        started = time.perf_counter()
+        ok = False
+        try:
+            async with session.request(method, url, data=data, params=params) as response:
+                text = await response.text()
+                ok = response.status < 400
+                return str(response.url), text
+        finally:
+            self.stats.add(endpoint, time.perf_counter() - started, ok)
+
+    async def _submit(self, session, endpoint, page_url, html, button, data=None, **match):
+        form = _find_form(page_url, html, button, **match)
+        button = button or next(iter(form.buttons), None)
+        method = "POST" if form.method == "post" else "GET"
+        values = form.values(button, data)
+        if method == "POST":
+            return await self._request(session, endpoint, method, form.action, data=values)
+        return await self._request(session, endpoint, method, form.action, params=values)
+
+    async def run(self):
+        jar = aiohttp.CookieJar(unsafe=True)    # unsafe: keep cookies for IP hosts like 127.0.0.1
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with aiohttp.ClientSession(cookie_jar=jar, timeout=timeout) as session:
+            # log in
+            url, html = await self._request(session, "GET index.php", "GET", "index.php")
+            url, html = await self._submit(session, "POST index.php (login)", url, html, None,
+                                           {"username": self.account.username,
+                                            "password": self.account.password}, field="username")
+            if settings.HOME_PAGES["customer"] not in url:
+                raise JourneyError(f"login as {self.account.username} ended on {url}")
+
+            # browse and search
+            await self._request(session, "GET customer_home.php", "GET", "customer/customer_home.php")
+            product = self.rng.choice(list(self.products.values()))
+            url, html = await self._request(session, "GET customer_home.php?search", "GET",
+                                            "customer/customer_home.php", params={"search": product.name})
+
+            # add to cart
+            quantity = self.rng.randint(1, 3)
+            url, html = await self._submit(session, "POST customer_home.php (add)", url, html, "add_to_cart",
+                                           {"quantity": str(quantity)}, field_value=("product_id", str(product.id)))
+
+            # update the quantity on the cart page
+            url, html = await self._request(session, "GET cart.php", "GET", "customer/cart.php")
+            quantity = self.rng.randint(1, 3)
+            url, html = await self._submit(session, "POST cart.php (update)", url, html, "update_cart",
+                                           {f"quantities[{product.id}]": str(quantity)})
+            cart = _cart_quantities(url, html)
+            if cart.get(product.id) != quantity:
+                raise JourneyError(f"cart shows {cart.get(product.id)} x {product.name}, expected {quantity}")
+
+            # pay
+            url, html = await self._request(session, "GET pay.php", "GET", "customer/pay.php")
+            url, html = await self._submit(session, "POST pay.php (pay_now)", url, html, "pay_now")
+            page = parse_html(html)
+            message, error = page.find(class_="message"), page.find(class_="error")
+            if message is not None and "successfully bought" in message.text.lower():
+                self.stats.bought.update(cart)
+                self.stats.journeys["completed"] += 1
+            elif error is not None and "stock" in error.text.lower():
+                self.stats.journeys["out of stock"] += 1
+            else:
+                raise JourneyError(f"pay_now for {self.account.username} showed no confirmation")
+
+            await self._request(session, "GET logout.php", "GET", "logout.php")
+
+
+def _find_form(page_url, html, button, field=None, field_value=None):
+    """First form with submit `button` (any, if None) and the given field / field value."""
+    root = parse_html(html)
+    for element in root.find_all("form"):
+        form = Form(element, page_url)
+        if button is not None and button not in form.buttons:
+            continue
+        if field and field not in form.fields:
+            continue
+        if field_value and form.fields.get(field_value[0]) != field_value[1]:
+            continue
+        return form
+    raise JourneyError(f"no form with button {button!r} / field {field or field_value!r} on {page_url}")
+
+
+def _cart_quantities(page_url, html):
+    """{product_id: quantity} from the cart page's update form."""
+    quantities = {}
+    for element in parse_html(html).find_all("form"):
+        for name, value in Form(element, page_url).fields.items():
+            if name.startswith("quantities[") and value:
+                quantities[int(name[len("quantities["):-1])] = int(value)
+    return quantities
+
+
+# ---------- RUNNER ----------
+async def run_load(accounts, products, rate, duration, seed=None):
+    """Start journeys at `rate`/s for `duration` s, one account per running journey."""
+    rng = random.Random(seed)
+    stats = LoadStats()
+    idle = asyncio.Queue()
+    for account in accounts:
+        idle.put_nowait(account)
+
+    async def one_journey():
+        account = await idle.get()
+        try:
+            await VirtualCustomer(account, products, stats, random.Random(rng.random())).run()
+        except Exception as exc:   # one broken journey must not stop the run
+            stats.journeys["failed"] += 1
+            if len(stats.failures) < 5:
+                stats.failures.append(f"{type(exc).__name__}: {exc}")
+        finally:
+            idle.put_nowait(account)
+
+    stats.started = time.monotonic()
+    deadline = stats.started + duration
+    tasks = []
+    while time.monotonic() < deadline:
+        tasks.append(asyncio.create_task(one_journey()))
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+    stats.finished = time.monotonic()
+    return stats
+
+
+def stock_levels(db, products):
+    return {product.id: db.query_one("SELECT stock FROM products WHERE id = %s", (product.id,))[0]
+            for product in products}
+
+
+def verify(db, products, stock_before, stats, accounts):
+    """Consistency problems after a run; an empty list means cart and stock add up."""
+    problems = []
+    stock_after = stock_levels(db, products)
+    for product in products:
+        sold = stock_before[product.id] - stock_after[product.id]
+        if stock_after[product.id] < 0:
+            problems.append(f"{product.name}: negative stock {stock_after[product.id]}")
+        if sold != stats.bought[product.id]:
+            problems.append(f"{product.name}: stock dropped by {sold} but {stats.bought[product.id]} "
+                            f"units were confirmed as bought")
+    user_ids = [account.id for account in accounts]
+    marks = ", ".join(["%s"] * len(user_ids))
+    bad_rows = db.query(
+        f"SELECT c.id, c.user_id, c.product_id, c.quantity FROM cart c "
+        f"LEFT JOIN products p ON c.product_id = p.id "
+        f"WHERE c.user_id IN ({marks}) AND c.bought = 'no' AND (p.id IS NULL OR c.quantity <= 0)",
+        user_ids,
+    )
+    for row in bad_rows:
+        problems.append(f"cart row {row[0]}: user {row[1]}, product {row[2]}, quantity {row[3]}")
+    return problems
+
+
+def run(db, users=10, rate=5.0, duration=10.0, products=3, stock=10000, seed=None):
+    """Create the load data, run the journeys, verify, clean up; returns (stats, problems)."""
+    factory = DataFactory(db)
+    try:
+        accounts = factory.users(users, password=DEFAULT_PASSWORD, prefix="load")
+        items = factory.products(products, price=100, stock=stock, prefix="LoadProduct")
+        stock_before = stock_levels(db, items)
+        stats = asyncio.run(run_load(accounts, items, rate, duration, seed))
+        return stats, verify(db, items, stock_before, stats, accounts)
+    finally:
+        factory.cleanup()
+
+
+def main(argv=None):
+    from harness.db import SQLiteDatabase, get_db
+    from harness.standin import StandInShop
+
+    parser = argparse.ArgumentParser(prog="python -m harness.load", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--standin", action="store_true", help="run against a fresh SQLite stand-in")
+    parser.add_argument("--users", type=int, default=10, help="virtual customers (max concurrent journeys)")
+    parser.add_argument("--rate", type=float, default=5.0, help="journeys started per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to keep starting journeys")
+    parser.add_argument("--products", type=int, default=3)
+    parser.add_argument("--stock", type=int, default=10000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    shop = None
+    if args.standin:
+        shop = StandInShop().start()
+        settings.BASE_URL = shop.base_url
+        db = SQLiteDatabase(shop.db_path)
+    else:
+        settings.BASE_URL = args.base_url
+        db = get_db()
+    try:
+        stats, problems = run(db, args.users, args.rate, args.duration, args.products, args.stock, args.seed)
+    finally:
+        db.close()
+        if shop is not None:
+            shop.stop()
+    print("\n".join(stats.report()))
+    if problems:
+        print("❌ cart/stock inconsistent after the run:")
+        print("\n".join(f"  {problem}" for problem in problems))
+        return 1
+    print("✅ cart and stock rows consistent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Every request a page made, read from Chrome's performance log.
+
+With --network-capture DIR (or MINISHOP_NETWORK_LOG=1 for a driver created
+by hand) Chrome records its DevTools Network events. collect() drains them
+from a driver and turns them into one entry per request:
+
+    url, method, type (Document, Stylesheet, Script, Image, ...), status,
+    mimeType, size (bytes on the wire), time (ms), timings (blocked, dns,
+    connect, ssl, send, wait, receive in ms) and cache ("memory", "disk",
+    "revalidated" for a 304, or None for a network fetch)
+
+Requests are grouped by the navigation (page load) that issued them. to_har()
+writes them in the HAR 1.2 layout most viewers understand, and check()
+flags what is worth a look:
+
+    size       a resource larger than SIZE_BUDGET bytes
+    latency    a request that took longer than LATENCY_BUDGET_MS
+    repeated   the same method + URL requested more than once by one page
+    failed     a request that never got a response, or a 4xx/5xx status
+
+    pytest --network-capture network/
+"""
+import json
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+
+SIZE_BUDGET = 200 * 1024
+LATENCY_BUDGET_MS = 500
+
+NETWORK_EVENTS = {"Network.requestWillBeSent", "Network.responseReceived", "Network.loadingFinished",
+                  "Network.loadingFailed", "Network.requestServedFromCache"}
+
+
+# ---------- COLLECTING ----------
+def _phase(timing, start, end):
+    if not timing or timing.get(start, -1) < 0 or timing.get(end, -1) < 0:
+        return -1
+    return round(timing[end] - timing[start], 2)
+
+
+def _timings(timing, total):
+    """HAR timing phases from a CDP ResourceTiming (all relative to requestTime, in ms)."""
+    if not timing:
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": total, "receive": 0}
+    first = next((timing[key] for key in ("dnsStart", "connectStart", "sendStart") if timing.get(key, -1) >= 0), 0)
+    wait = _phase(timing, "sendEnd", "receiveHeadersEnd")
+    return {
+        "blocked": round(first, 2),
+        "dns": _phase(timing, "dnsStart", "dnsEnd"),
+        "connect": _phase(timing, "connectStart", "connectEnd"),
+        "ssl": _phase(timing, "sslStart", "sslEnd"),
+        "send": max(0, _phase(timing, "sendStart", "sendEnd")),
+        "wait": max(0, wait),
+        "receive": round(max(0.0, total - timing.get("receiveHeadersEnd", 0)), 2),
+    }
+
+
+class _Request:
+    def __init__(self, params):
+        request = params["request"]
+        self.url = request["url"]
+        self.method = request.get("method", "GET")
+        self.type = params.get("type", "Other")
+        self.page = params.get("documentURL", self.url)
+        self.loader = params.get("loaderId")
+        self.started = params["timestamp"]           # monotonic seconds
+        self.wall_time = params.get("wallTime", time.time())
+        self.response = None
+        self.cache = None
+        self.size = None
+        self.finished = None
+        self.error = None
+
+    def respond(self, response):
+        self.response = response
+        if response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            self.cache = "disk"
+        elif response.get("status") == 304:
+            self.cache = "revalidated"
+
+    def entry(self):
+        response = self.response or {}
+        total = round(((self.finished or self.started) - self.started) * 1000, 2)
+        size = self.size if self.size is not None else response.get("encodedDataLength", 0)
+        return {
+            "page": self.page,
+            "navigation": self.loader or self.page,
+            "url": self.url,
+            "method": self.method,
+            "type": self.type,
+            "status": response.get("status", 0),
+            "mimeType": response.get("mimeType", ""),
+            "size": int(size or 0),
+            "time": total,
+            "timings": _timings(response.get("timing"), total),
+            "cache": self.cache,
+            "error": self.error,
+            "started": self.wall_time,
+        }
+
+
+def parse(log_entries):
+    """Entries from driver.get_log("performance") -> list of request dicts, in start order."""
+    requests = OrderedDict()   # (requestId, redirect hop) -> _Request
+    hops = Counter()
+    documents = {}             # loaderId -> URL of the document it loaded
+    for raw in log_entries:
+        message = json.loads(raw["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method not in NETWORK_EVENTS:
+            continue
+        request_id = params["requestId"]
+        current = requests.get((request_id, hops[request_id]))
+        if method == "Network.requestWillBeSent":
+            if current is not None and params.get("redirectResponse"):
+                # Same requestId again: the previous hop ended in a redirect
+                current.respond(params["redirectResponse"])
+                current.finished = params["timestamp"]
+                hops[request_id] += 1
+            started = _Request(params)
+            if started.type == "Document" and started.loader:
+                documents[started.loader] = started.url    # after redirects: the last hop
+            requests[(request_id, hops[request_id])] = started
+        elif current is None:
+            continue   # the request started before this log was last drained
+        elif method == "Network.responseReceived":
+            current.respond(params["response"])
+        elif method == "Network.requestServedFromCache":
+            current.cache = "memory"
+        elif method == "Network.loadingFinished":
+            current.finished = params["timestamp"]
+            current.size = params.get("encodedDataLength")
+        elif method == "Network.loadingFailed":
+            current.finished = params["timestamp"]
+            current.error = params.get("errorText") or "failed"
+    for request in requests.values():
+        request.page = documents.get(request.loader, request.page)
+    return [request.entry() for request in requests.values()]
+
+
+def collect(driver):
+    """Drain the driver's performance log; [] when network logging is off."""
+    try:
+        return parse(driver.get_log("performance"))
+    except Exception:
+        return []
+
+
+# ---------- CHECKING ----------
+def check(entries, size_budget=SIZE_BUDGET, latency_budget_ms=LATENCY_BUDGET_MS):
+    """Findings as strings; an empty list means every request was within budget."""
+    findings = []
+    per_page = Counter((entry["navigation"], entry["page"], entry["method"], entry["url"]) for entry in entries)
+    for (_, page, method, url), count in per_page.items():
+        if count > 1:
+            findings.append(f"repeated: {method} {url} requested {count}x by {page}")
+    for entry in entries:
+        if entry["size"] > size_budget:
+            findings.append(f"size: {entry['url']} is {entry['size'] / 1024:.0f} KB "
+                            f"(budget {size_budget / 1024:.0f} KB)")
+        if entry["time"] > latency_budget_ms:
+            findings.append(f"latency: {entry['url']} took {entry['time']:.0f}ms "
+                            f"(budget {latency_budget_ms:.0f}ms)")
+        if entry["error"] or entry["status"] >= 400:
+            findings.append(f"failed: {entry['url']} -> {entry['error'] or entry['status']}")
+    return findings
+
+
+# ---------- HAR ----------
+def _iso(wall_time):
+    return datetime.fromtimestamp(wall_time, timezone.utc).isoformat(timespec="milliseconds")
+
+
+def to_har(entries, findings=(), comment=""):
+    pages = OrderedDict()      # navigation -> (URL, start)
+    for entry in entries:
+        pages.setdefault(entry["navigation"], (entry["page"], entry["started"]))
+    page_ids = {navigation: f"page_{number}" for number, navigation in enumerate(pages, 1)}
+    return {"log": {
+        "version": "1.2",
+        "creator": {"name": "minishop-tests", "version": "1"},
+        "comment": comment,
+        "pages": [{"id": page_ids[navigation], "title": page, "startedDateTime": _iso(started),
+                   "pageTimings": {}} for navigation, (page, started) in pages.items()],
+        "entries": [{
+            "pageref": page_ids[entry["navigation"]],
+            "startedDateTime": _iso(entry["started"]),
+            "time": entry["time"],
+            "request": {"method": entry["method"], "url": entry["url"], "httpVersion": "",
+                        "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1},
+            "response": {"status": entry["status"], "statusText": entry["error"] or "", "httpVersion": "",
+                         "headers": [], "cookies": [], "redirectURL": "", "headersSize": -1,
+                         "bodySize": entry["size"],
+                         "content": {"size": entry["size"], "mimeType": entry["mimeType"]}},
+            "cache": {},
+            "timings": entry["timings"],
+            "_resourceType": entry["type"],
+            "_cache": entry["cache"],
+        } for entry in entries],
+        "_findings": list(findings),
+    }}
+
+
+def write_har(path, entries, findings=(), comment=""):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_har(entries, findings, comment), f, indent=1)
+    return path
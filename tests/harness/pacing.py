@@ -0,0 +1,104 @@
+"""Deliberate pauses (step waits, human-like typing) behind named profiles.
+
+The per-module helpers (slow_step, human_typing, slow_type, ...) all end up
+here, so a single --pace option decides whether the suite runs at a
+watchable speed or as fast as the app allows:
+
+    demo  today's timing: every pause is slept, typing is one key at a time
+    ci    no deliberate pauses, step messages are still printed
+    zero  no deliberate pauses and no step messages
+
+Every pause is booked against the running test, both what the profile slept
+and what it skipped, so the end-of-run report shows where the time went.
+"""
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    sleep: bool     # actually sleep, or only account for the pause
+    verbose: bool   # print "⏳ ..." step messages
+
+
+PROFILES = {
+    "demo": Profile("demo", sleep=True, verbose=True),
+    "ci": Profile("ci", sleep=False, verbose=True),
+    "zero": Profile("zero", sleep=False, verbose=False),
+}
+DEFAULT_PROFILE = "demo"
+
+profile = PROFILES[DEFAULT_PROFILE]
+
+# nodeid -> seconds; filled in as tests run
+slept = defaultdict(float)
+skipped = defaultdict(float)
+_current_test = None
+
+
+def use(name):
+    """Switch the active profile by name."""
+    global profile
+    profile = PROFILES[name]
+
+
+def begin_test(nodeid):
+    global _current_test
+    _current_test = nodeid
+
+
+def end_test():
+    global _current_test
+    _current_test = None
+
+
+def pause(seconds):
+    """Deliberate pause with no message (observation time, settle time)."""
+    if seconds <= 0:
+        return
+    key = _current_test or "<outside tests>"
+    if profile.sleep:
+        time.sleep(seconds)
+        slept[key] += seconds
+    else:
+        skipped[key] += seconds
+
+
+def step(msg, seconds):
+    """Log a step and pause after it."""
+    if profile.verbose:
+        print(f"⏳ {msg} (waiting {seconds if profile.sleep else 0}s)")
+    pause(seconds)
+
+
+def type_text(element, text, delay):
+    """Type into an element; one key per `delay` seconds only when the profile sleeps."""
+    text = str(text)
+    if profile.sleep:
+        for char in text:
+            element.send_keys(char)
+            pause(delay)
+    else:
+        element.send_keys(text)
+        pause(delay * len(text))
+
+
+def click(element, wait):
+    """Click an element, then pause."""
+    element.click()
+    pause(wait)
+
+
+def report(limit=10):
+    """Lines for the terminal summary: total and the tests that paused the most."""
+    booked = slept if profile.sleep else skipped
+    total = sum(booked.values())
+    if not total:
+        return []
+    verb = "slept" if profile.sleep else "skipped"
+    lines = [f"pace={profile.name}: {total:.1f}s of deliberate pauses {verb}"]
+    for nodeid, seconds in sorted(booked.items(), key=lambda kv: kv[1], reverse=True)[:limit]:
+        lines.append(f"  {seconds:7.1f}s  {nodeid}")
+    return lines
@@ -0,0 +1,278 @@
+"""Page objects for the minishop pages the suite drives in Chrome.
+
+Each page names its locators once (LOCATORS) and resolves them lazily. A
+resolved WebElement is kept until the page object sees a navigation (open(),
+or a click that submits/follows a link), so repeated reads of the same field
+cost no extra round trip to chromedriver. If a cached handle has gone stale
+anyway - the app re-rendered, or a test navigated with driver.get() - it is
+looked up again and the action retried once, instead of the test failing
+or needing a sleep.
+
+    cart = CartPage(driver).open()
+    cart.set_quantity(product_id, 3)
+    cart.update()
+    cart.total_price()
+
+Locators with "{}" take arguments: element("quantity", product_id).
+"""
+from urllib.parse import urlencode
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from harness import pacing, settings
+from harness.snapshot import table, texts
+
+WAIT = 10
+TYPE_DELAY = 0.15
+
+
+def parse_amount(text):
+    """Amount from text like 'Total Price: ₹1,22,000.00'."""
+    return float(text.split("₹")[-1].replace(",", "").strip())
+
+
+class Page:
+    PATH = None
+    LOCATORS = {}
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._cache = {}
+
+    # ---------- NAVIGATION ----------
+    @classmethod
+    def url(cls):
+        return settings.shop_url(cls.PATH)
+
+    def open(self, **params):
+        self.driver.get(self.url() + ("?" + urlencode(params) if params else ""))
+        self.navigated()
+        return self
+
+    def navigated(self):
+        """Forget cached handles; they belong to the previous document."""
+        self._cache.clear()
+
+    def wait_for_url(self, fragment, timeout=WAIT):
+        WebDriverWait(self.driver, timeout).until(EC.url_contains(fragment))
+        self.navigated()
+        return self.driver.current_url
+
+    # ---------- ELEMENTS ----------
+    def locator(self, name, *args):
+        by, value = self.LOCATORS[name]
+        return by, value.format(*args) if args else value
+
+    def element(self, name, *args, timeout=WAIT):
+        """Cached WebElement for a named locator, waiting for it on first use."""
+        key = (name, args)
+        element = self._cache.get(key)
+        if element is None:
+            element = WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located(self.locator(name, *args))
+            )
+            self._cache[key] = element
+        return element
+
+    def elements(self, name, *args):
+        """All current matches, without waiting (empty list when there are none)."""
+        return self.driver.find_elements(*self.locator(name, *args))
+
+    def visible(self, name, *args, timeout=WAIT):
+        element = WebDriverWait(self.driver, timeout).until(
+            EC.visibility_of_element_located(self.locator(name, *args))
+        )
+        self._cache[(name, args)] = element
+        return element
+
+    def act(self, name, action, *args):
+        """Run action(element) on the cached handle, re-resolving it once if stale."""
+        try:
+            return action(self.element(name, *args))
+        except StaleElementReferenceException:
+            self._cache.pop((name, args), None)
+            return action(self.element(name, *args))
+
+    # ---------- ACTIONS ----------
+    def text(self, name, *args):
+        return self.act(name, lambda element: element.text, *args)
+
+    def value(self, name, *args):
+        return self.act(name, lambda element: element.get_attribute("value"), *args)
+
+    def type(self, name, text, *args, delay=TYPE_DELAY, clear=False):
+        def fill(element):
+            if clear:
+                element.clear()
+            pacing.type_text(element, text, delay)
+        self.act(name, fill, *args)
+
+    def click(self, name, *args, wait=0, navigates=True):
+        """Click; `navigates` drops the cache because a new document is coming."""
+        self.act(name, lambda element: pacing.click(element, wait), *args)
+        if navigates:
+            self.navigated()
+
+    def js_click(self, name, *args, navigates=True):
+        """Click through JavaScript, for buttons covered by other elements."""
+        self.act(name, lambda element: self.driver.execute_script("arguments[0].click();", element), *args)
+        if navigates:
+            self.navigated()
+
+
+# ---------- PUBLIC PAGES ----------
+class LoginPage(Page):
+    PATH = "index.php"
+    LOCATORS = {
+        "username": (By.ID, "username"),
+        "password": (By.ID, "password"),
+        "submit": (By.CSS_SELECTOR, "button.login-btn"),
+        "error": (By.CLASS_NAME, "error"),
+    }
+
+    def login(self, username, password, delay=0):
+        self.type("username", username, delay=delay)
+        self.type("password", password, delay=delay)
+        self.click("submit")
+
+
+class SignupPage(Page):
+    PATH = "signup.php"
+    LOCATORS = {
+        "username": (By.ID, "username"),
+        "password": (By.ID, "password"),
+        "confirm": (By.ID, "confirm"),
+        "submit": (By.CSS_SELECTOR, "button.signup-btn"),
+        "success": (By.CLASS_NAME, "success"),
+        "error": (By.CLASS_NAME, "error"),
+    }
+
+    def sign_up(self, username, password, confirm=None, delay=TYPE_DELAY):
+        self.type("username", username, delay=delay)
+        self.type("password", password, delay=delay)
+        self.type("confirm", password if confirm is None else confirm, delay=delay)
+        self.click("submit")
+
+
+# ---------- CUSTOMER PAGES ----------
+_PRODUCT_BOX = ("//div[contains(@class,'product-box')]//h3[text()='{}']"
+                "/ancestor::div[contains(@class,'product-box')]")
+
+
+class CustomerHomePage(Page):
+    PATH = "customer/customer_home.php"
+    LOCATORS = {
+        "welcome": (By.TAG_NAME, "h2"),
+        "product_box": (By.CLASS_NAME, "product-box"),
+        "product_name": (By.CSS_SELECTOR, ".product-box h3"),
+        "product": (By.XPATH, _PRODUCT_BOX),
+        "quantity": (By.XPATH, _PRODUCT_BOX + "//*[contains(@class,'qty-input')]"),
+        "plus": (By.XPATH, _PRODUCT_BOX + "//*[contains(@class,'plus')]"),
+        "add": (By.XPATH, _PRODUCT_BOX + "//*[contains(@class,'add-btn')]"),
+        "logout": (By.LINK_TEXT, "Logout"),
+    }
+
+    def search(self, query):
+        return self.open(search=query)
+
+    def product_names(self):
+        self.element("product_name")
+        return texts(self.driver, ".product-box h3")
+
+
+class CartPage(Page):
+    PATH = "customer/cart.php"
+    LOCATORS = {
+        "rows": (By.CSS_SELECTOR, "table tr"),
+        "quantity": (By.NAME, "quantities[{}]"),
+        "update": (By.NAME, "update_cart"),
+        "total": (By.XPATH, "//h3[contains(text(),'Total Price')]"),
+        "pay_now": (By.NAME, "pay_now"),
+        "continue": (By.PARTIAL_LINK_TEXT, "Continue"),
+        "logout": (By.LINK_TEXT, "Logout"),
+    }
+
+    def lines(self):
+        """Cart table rows as lists of cell texts (header row excluded)."""
+        self.element("rows")
+        return table(self.driver)["rows"]
+
+    def set_quantity(self, product_id, quantity, delay=0.3):
+        self.type("quantity", str(quantity), product_id, delay=delay, clear=True)
+
+    def update(self):
+        self.js_click("update")
+
+    def total_price(self):
+        return parse_amount(self.text("total"))
+
+
+class PayPage(Page):
+    PATH = "customer/pay.php"
+    LOCATORS = {
+        "total": (By.XPATH, "//h3[contains(text(),'Total Price')]"),
+        "pay": (By.TAG_NAME, "button"),
+        "message": (By.CLASS_NAME, "message"),
+        "back": (By.XPATH, "//div[@class='back-btn']/a"),
+    }
+
+    def total_price(self):
+        return parse_amount(self.text("total"))
+
+    def pay(self):
+        self.js_click("pay")
+
+    def message(self):
+        return self.text("message")
+
+
+# ---------- ADMIN PAGES ----------
+class AdminHomePage(Page):
+    PATH = "admin/admin_home.php"
+    LOCATORS = {
+        "heading": (By.TAG_NAME, "h2"),
+        "card": (By.CLASS_NAME, "card"),
+        "link": (By.LINK_TEXT, "{}"),
+        "table": (By.TAG_NAME, "table"),
+        "back": (By.LINK_TEXT, "← Back to Index"),
+    }
+
+    def table_headers(self):
+        self.element("table")
+        return table(self.driver)["headers"]
+
+
+class AddProductPage(Page):
+    PATH = "admin/add_product.php"
+    LOCATORS = {
+        "title": (By.CLASS_NAME, "add-product-title"),
+        "name": (By.ID, "name"),
+        "price": (By.ID, "price"),
+        "stock": (By.ID, "stock"),
+        "submit": (By.CLASS_NAME, "add-btn"),
+        "error": (By.CLASS_NAME, "error"),
+        "back": (By.LINK_TEXT, "⬅ Back"),
+    }
+
+
+class DeleteProductPage(Page):
+    PATH = "admin/delete_product.php"
+    LOCATORS = {
+        "product_id": (By.ID, "product_id"),
+        "submit": (By.CLASS_NAME, "delete-btn"),
+        "back": (By.CLASS_NAME, "back-btn"),
+    }
+
+
+class UpdateStockPage(Page):
+    PATH = "admin/update_stock.php"
+    LOCATORS = {
+        "product_id": (By.ID, "product_id"),
+        "check": (By.NAME, "check_product"),
+        "new_stock": (By.ID, "new_stock"),
+        "update": (By.NAME, "update_stock"),
+        "back": (By.CLASS_NAME, "back-btn"),
+    }
@@ -0,0 +1,124 @@
+"""Chrome processes started ahead of demand.
+
+Launching Chrome blocks for one to three seconds. BrowserPool launches
+`size` browsers in background threads as soon as it is created, hands out a
+running one on lease(), and on release() either recycles it (browser.reset:
+one fresh about:blank tab; cookies, cache, storage and service workers
+cleared through DevTools) or, if it is broken or has been used max_uses
+times, quits it and launches a replacement in the background. The
+launch therefore overlaps with whatever test is running instead of sitting
+in front of the next one. Warm, launching and leased browsers together stay
+at `size`; a browser launched because more were leased at once is quit when
+it comes back.
+
+    pool = BrowserPool(size=2)
+    driver = pool.lease()
+    ...
+    pool.release(driver)               # recycle
+    pool.release(driver, discard=True)  # this process must really end
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from harness.browser import new_driver, reset
+
+POOL_SIZE = int(os.environ.get("MINISHOP_BROWSER_POOL", "1"))
+MAX_USES = 50            # recycle a browser this many times, then replace it
+LAUNCH_TIMEOUT = 60
+
+
+class BrowserPool:
+    def __init__(self, size=POOL_SIZE, launch=new_driver, max_uses=MAX_USES):
+        self.size = size
+        self.launch = launch
+        self.max_uses = max_uses
+        self._executor = ThreadPoolExecutor(max_workers=max(1, size), thread_name_prefix="browser-pool")
+        self._ready = queue.Queue()    # futures of drivers: launching or idle
+        self._uses = {}                # id(driver) -> completed leases
+        self._leased = {}              # id(driver) -> driver
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self):
+        self._ready.put(self._executor.submit(self.launch))
+
+    def _idle(self, driver):
+        future = Future()
+        future.set_result(driver)
+        self._ready.put(future)
+
+    def _short(self):
+        """True when fewer than `size` browsers are warm, launching or leased."""
+        with self._lock:
+            return self._ready.qsize() + len(self._leased) < self.size
+
+    # ---------- PUBLIC API ----------
+    def lease(self, timeout=LAUNCH_TIMEOUT):
+        """A running browser; launches one now only if none is warm or launching."""
+        try:
+            future = self._ready.get_nowait()
+        except queue.Empty:
+            self._spawn()
+            future = self._ready.get_nowait()
+        driver = future.result(timeout=timeout)
+        with self._lock:
+            self._leased[id(driver)] = driver
+        if self._short() and not self._closed:
+            self._spawn()    # top up in the background while this lease is in use
+        return driver
+
+    def release(self, driver, discard=False):
+        """Give a leased browser back: recycled when healthy, replaced otherwise."""
+        with self._lock:
+            self._leased.pop(id(driver), None)
+            uses = self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+        if self._closed:
+            driver.quit()
+            return
+        # More leases at once than `size` launched extra browsers: quit those rather than keep them warm
+        if not discard and uses < self.max_uses and self._short() and self._recycle(driver):
+            self._idle(driver)
+            return
+        self._uses.pop(id(driver), None)
+        self._executor.submit(self._quit, driver)
+        if self._short():
+            self._spawn()
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            leased = list(self._leased.values())
+            self._leased.clear()
+        for driver in leased:
+            self._quit(driver)
+        while True:
+            try:
+                future = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._quit(future.result(timeout=LAUNCH_TIMEOUT))
+            except Exception:
+                pass    # a launch that failed has nothing to quit
+        self._executor.shutdown(wait=True)
+
+    # ---------- HELPERS ----------
+    @staticmethod
+    def _recycle(driver):
+        """Return the browser to a blank, logged-out state; False if it is unusable."""
+        try:
+            reset(driver)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,66 @@
+"""Test prerequisites declared with a marker and built straight in the DB.
+
+Instead of one test creating a product and stashing its id on the class for
+the next test (which then skips when run alone, or on another xdist worker),
+a test states what it needs and receives it from the `needs` fixture:
+
+    @pytest.mark.needs("product", price=456, stock=20, prefix="DeleteTest", fresh=True)
+    def test_delete_existing_product(self, login_admin, db, needs):
+        delete(needs.product.id)
+
+Each marker names a KIND from BUILDERS plus the keyword arguments for its
+factory call. Identical requests share one object for the whole session;
+fresh=True builds a private one for a test that deletes or edits it. Use
+as_="name" to ask for two of the same kind. Everything is created through
+the session DataFactory, so it is deleted again when the session ends.
+"""
+from types import SimpleNamespace
+
+from harness.factory import ScenarioSpec
+
+# kind -> builder(factory, **spec)
+BUILDERS = {
+    "product": lambda factory, **spec: factory.product(**spec),
+    "customer": lambda factory, **spec: factory.user(role="customer", **spec),
+    "admin": lambda factory, **spec: factory.user(role="admin", **spec),
+    "scenario": lambda factory, name=None, **spec: factory.scenario(name or ScenarioSpec(**spec)),
+}
+
+
+class Prerequisites:
+    """Builds what tests declare, sharing identical non-fresh requests per session."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._shared = {}
+
+    def build(self, kind, fresh=False, **spec):
+        if kind not in BUILDERS:
+            raise ValueError(f"unknown prerequisite {kind!r}; known: {', '.join(BUILDERS)}")
+        key = (kind, tuple(sorted(spec.items())))
+        if not fresh and key in self._shared:
+            return self._shared[key]
+        built = BUILDERS[kind](self.factory, **spec)
+        if not fresh:
+            self._shared[key] = built
+        return built
+
+    def for_markers(self, markers):
+        """SimpleNamespace of everything the `needs` markers ask for, by kind (or as_)."""
+        built = {}
+        for marker in markers:
+            kind, = marker.args
+            spec = dict(marker.kwargs)
+            name = spec.pop("as_", kind)
+            if name in built:
+                raise ValueError(f"two `needs` markers provide {name!r}; give one of them as_=")
+            built[name] = self.build(kind, **spec)
+        return SimpleNamespace(**built)
+
+    def share(self, markers):
+        """Build the shared (non-fresh) requests of `markers` now, ahead of the tests that use them."""
+        for marker in markers:
+            kind, = marker.args
+            spec = {key: value for key, value in marker.kwargs.items() if key != "as_"}
+            if not spec.get("fresh"):
+                self.build(kind, **spec)
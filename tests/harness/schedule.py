@@ -0,0 +1,109 @@
+"""Split the tests across CI shards by how long they take.
+
+A test here takes anything from under a second (test_http_*) to over a
+minute (TestUpdateStock typing stock values, the signup tests typing like a
+human), so splitting by count leaves one shard running long after the
+others are done. split() uses each test's mean duration from the flake
+history (harness/flakes.py) and assigns longest-processing-time first: the
+longest remaining unit goes to the bin with the least work so far.
+
+A unit is every test that logs a browser in as the same role, so each role
+browser is started and logged in on one shard only. Tests without a role
+browser are units of their own. A role group longer than one bin's fair
+share would bound the whole run, so it is split by test file instead.
+
+Tests never run yet count as the median known duration of their kind
+(browser or http). Within a bin the
+tests keep their collection order, so module and class fixtures still run
+once.
+
+    pytest --shard 2/4               this CI job runs the second of four shards
+    pytest --shard 2/4 -n 4          the shard, spread over the workers by --dist
+
+Within one run xdist does the spreading: its controller only sees node ids,
+not the fixtures a role group is made of, so there is no split per worker.
+"""
+from collections import OrderedDict, defaultdict
+
+DEFAULT_DURATION = 5.0   # seconds, when no test has any history yet
+
+# fixture -> role whose logged-in browser it holds (one per process)
+ROLE_FIXTURES = {
+    "login_admin": "admin",
+    "admin_browser": "admin",
+    "login_customer": "customer",
+    "customer_browser": "customer",
+}
+
+
+def parse_shard(text):
+    """"2/4" -> (1, 4): zero-based index and count."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard expects i/N, e.g. 2/4, not {text!r}") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"--shard {text}: i must be between 1 and N")
+    return index - 1, count
+
+
+def role_of(item):
+    return next((ROLE_FIXTURES[name] for name in item.fixturenames if name in ROLE_FIXTURES), None)
+
+
+def _kind(item):
+    return "browser" if item.get_closest_marker("browser") else "http"
+
+
+def durations_of(items, known):
+    """nodeid -> estimated seconds; `known(nodeid)` returns the history's mean or None."""
+    found = {item.nodeid: known(item.nodeid) for item in items}
+    measured = defaultdict(list)
+    for item in items:
+        if found[item.nodeid] is not None:
+            measured[_kind(item)].append(found[item.nodeid])
+    # A browser test never run is no faster than the browser tests we know, whatever the HTTP ones take
+    fallback = {kind: sorted(values)[len(values) // 2] for kind, values in measured.items()}
+    estimates = {}
+    for item in items:
+        if item.get_closest_marker("skip"):
+            estimates[item.nodeid] = 0.0    # --benchmark off, --skip-unchanged, ...
+        elif found[item.nodeid] is None:
+            estimates[item.nodeid] = fallback.get(_kind(item), DEFAULT_DURATION)
+        else:
+            estimates[item.nodeid] = found[item.nodeid]
+    return estimates
+
+
+def units_of(items, durations, bins):
+    """[(seconds, key, [items])]: role groups, split by file when one would not fit a bin."""
+    share = sum(durations.values()) / bins
+    groups = OrderedDict()
+    for item in items:
+        role = role_of(item)
+        groups.setdefault(f"role:{role}" if role else item.nodeid, []).append(item)
+    units = []
+    for key, members in groups.items():
+        if key.startswith("role:") and sum(durations[item.nodeid] for item in members) > share:
+            by_file = OrderedDict()
+            for item in members:
+                by_file.setdefault(f"{key}:{item.nodeid.split('::')[0]}", []).append(item)
+            parts = by_file.items()
+        else:
+            parts = [(key, members)]
+        for part, part_items in parts:
+            units.append((sum(durations[item.nodeid] for item in part_items), part, part_items))
+    return units
+
+
+def split(items, bins, known):
+    """Assign items to `bins` bins, longest unit first; returns ([[items], ...], [seconds, ...])."""
+    durations = durations_of(items, known)
+    loads = [0.0] * bins
+    assigned = defaultdict(set)
+    # Ties broken by key, so every xdist worker and shard computes the same split
+    for seconds, _, members in sorted(units_of(items, durations, bins), key=lambda unit: (-unit[0], unit[1])):
+        target = min(range(bins), key=lambda index: (loads[index], index))
+        loads[target] += seconds
+        assigned[target].update(item.nodeid for item in members)
+    return [[item for item in items if item.nodeid in assigned[index]] for index in range(bins)], loads
@@ -0,0 +1,36 @@
+"""Where the shop lives and which accounts the suite logs in with.
+
+Everything can be overridden from the pytest command line (see conftest.py)
+or with the matching MINISHOP_* environment variable.
+"""
+import os
+
+BASE_URL = os.environ.get("MINISHOP_URL", "http://localhost/minishop")
+
+# ---------- ACCOUNTS ----------
+ADMIN_USER = os.environ.get("MINISHOP_ADMIN_USER", "admin")
+ADMIN_PASSWORD = os.environ.get("MINISHOP_ADMIN_PASSWORD", "admin123")
+CUSTOMER_USER = os.environ.get("MINISHOP_CUSTOMER_USER", "abc")            # change to an existing DB username
+CUSTOMER_PASSWORD = os.environ.get("MINISHOP_CUSTOMER_PASSWORD", "abc")    # change to that user's password
+
+# Product the customer tests add to the cart (ignored with --isolated-data)
+PRODUCT_NAME = os.environ.get("MINISHOP_PRODUCT", "botte")                 # ensure this matches DB exactly
+
+# ---------- BROWSER ----------
+# "standard": a maximized Chrome as a person would see it
+# "lean": no images, fonts, extensions, GPU or off-site requests (see browser.py)
+BROWSER_PROFILE = os.environ.get("MINISHOP_BROWSER", "standard")
+HEADLESS = os.environ.get("MINISHOP_HEADLESS", "") not in ("", "0")
+# Let Chrome record its DevTools network events (see network.py); --network-capture turns it on
+NETWORK_LOG = os.environ.get("MINISHOP_NETWORK_LOG", "") not in ("", "0")
+
+# Landing page each role is redirected to after a successful login
+HOME_PAGES = {
+    "admin": "admin/admin_home.php",
+    "customer": "customer/customer_home.php",
+}
+
+
+def shop_url(path=""):
+    """Absolute URL of a minishop page, e.g. shop_url("customer/cart.php")."""
+    return f"{BASE_URL.rstrip('/')}/{path.lstrip('/')}"
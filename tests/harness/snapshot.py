@@ -0,0 +1,84 @@
+"""Read many elements from the page in one WebDriver round trip.
+
+Every WebElement.text or get_attribute() is a separate HTTP request to
+chromedriver, so reading a 200-product listing element by element costs
+200+ round trips. snapshot() sends one execute_script with a map of CSS
+selectors and gets back plain JSON for everything they match:
+
+    snap = snapshot(driver, {"names": ".product-box h3", "table": "table"})
+    [item["text"] for item in snap["names"]]
+    snap["table"][0]["rows"]          # [["ID", "Product Name", ...], [...], ...]
+
+Each matched element comes back as a dict with
+    tag, text, visible, value, href (resolved, like get_attribute("href")),
+    attrs (all attributes), rows (tables: cell texts per row) and
+    items (ul/ol: text per <li>).
+"""
+
+SNAPSHOT_JS = """
+const selectors = arguments[0];
+const scope = arguments[1] || document;
+
+function visible(el) {
+    const style = window.getComputedStyle(el);
+    return style.visibility !== "hidden" && style.display !== "none"
+        && el.getClientRects().length > 0;
+}
+
+function text(el) {
+    return (el.innerText !== undefined ? el.innerText : el.textContent || "").trim();
+}
+
+function describe(el) {
+    const attrs = {};
+    for (const attr of el.attributes) {
+        attrs[attr.name] = attr.value;
+    }
+    const item = {
+        tag: el.tagName.toLowerCase(),
+        text: text(el),
+        visible: visible(el),
+        value: el.value === undefined ? null : String(el.value),
+        href: el.href === undefined ? null : String(el.href),
+        attrs: attrs,
+    };
+    if (item.tag === "table") {
+        item.rows = Array.from(el.rows, row => Array.from(row.cells, text));
+    } else if (item.tag === "ul" || item.tag === "ol") {
+        item.items = Array.from(el.querySelectorAll(":scope > li"), text);
+    }
+    return item;
+}
+
+const result = {};
+for (const [name, css] of Object.entries(selectors)) {
+    result[name] = Array.from(scope.querySelectorAll(css), describe);
+}
+return result;
+"""
+
+
+def snapshot(driver, selectors, within=None):
+    """{name: [element dict, ...]} for each CSS selector, read in one round trip.
+
+    `within` is an optional WebElement to search inside instead of the document.
+    """
+    return driver.execute_script(SNAPSHOT_JS, dict(selectors), within)
+
+
+def texts(driver, css, within=None):
+    """Text of every element matching `css`."""
+    return [item["text"] for item in snapshot(driver, {"matches": css}, within)["matches"]]
+
+
+def table(driver, css="table", within=None):
+    """First table matching `css` as {"headers": [...], "rows": [[...], ...]}.
+
+    headers are the <th> cells of the first row; rows are the remaining rows.
+    Returns None when there is no such table.
+    """
+    tables = snapshot(driver, {"table": css}, within)["table"]
+    if not tables:
+        return None
+    rows = tables[0]["rows"]
+    return {"headers": rows[0] if rows else [], "rows": rows[1:]}
@@ -0,0 +1,564 @@
+"""Offline stand-in for the minishop PHP app, backed by SQLite.
+
+It serves the pages the suite talks to with the same URLs, form field names,
+element IDs and classes as the real app, so the tests and the harness can run
+on any machine without XAMPP or MySQL:
+
+    pytest --standin                      # whole suite against a fresh stand-in
+    python -m harness.standin [port]      # serve it for manual poking
+
+The database is a throw-away SQLite file with the users/products/cart schema
+of mini_shop, seeded with the default accounts from harness/settings.py.
+Only behaviour the tests rely on is imitated; styling is minimal.
+"""
+import hashlib
+import html
+import os
+import secrets
+import sqlite3
+import sys
+import tempfile
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from harness import settings
+
+APP_PREFIX = "/minishop/"
+
+SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'customer'
+);
+CREATE TABLE products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    stock INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE cart (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 1,
+    bought TEXT NOT NULL DEFAULT 'no'
+);
+"""
+
+SEED_USERS = [
+    (settings.ADMIN_USER, settings.ADMIN_PASSWORD, "admin"),
+    (settings.CUSTOMER_USER, settings.CUSTOMER_PASSWORD, "customer"),
+]
+SEED_PRODUCTS = [
+    (settings.PRODUCT_NAME, 500, 50),
+    ("Water Bottle", 250, 40),
+    ("Notebook", 120, 100),
+]
+
+STYLE = "body { font-family: sans-serif; } .error { color: #c00; } .success, .message { color: #080; }"
+
+
+def _md5(value):
+    return hashlib.md5(str(value).encode()).hexdigest()
+
+
+def connect(path):
+    """SQLite connection that understands the MySQL bits the tests use (MD5())."""
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.create_function("MD5", 1, _md5, deterministic=True)
+    conn.execute("PRAGMA busy_timeout = 30000")
+    return conn
+
+
+def create_database(path):
+    conn = connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO users (username, password, role) VALUES (?, MD5(?), ?)", SEED_USERS)
+    conn.executemany("INSERT INTO products (name, price, stock) VALUES (?, ?, ?)", SEED_PRODUCTS)
+    conn.close()
+
+
+# ---------- HTML ----------
+def esc(value):
+    return html.escape(str(value), quote=True)
+
+
+def money(amount):
+    return f"₹{amount:,.0f}" if float(amount).is_integer() else f"₹{amount:,.2f}"
+
+
+def page(title, body, depth=0):
+    root = "../" * depth
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>Mini Shop - {esc(title)}</title>"
+        f"<link rel='stylesheet' href='{root}css/style.css'>"
+        f"</head><body>{body}</body></html>"
+    )
+
+
+def notice(kind, text):
+    return f"<div class='{kind}'>{esc(text)}</div>" if text else ""
+
+
+QTY_SCRIPT = """
+<script>
+document.querySelectorAll('.product-box').forEach(function (box) {
+  var input = box.querySelector('.qty-input');
+  box.querySelector('.plus').addEventListener('click', function () {
+    input.value = parseInt(input.value || '0', 10) + 1;
+  });
+  box.querySelector('.minus').addEventListener('click', function () {
+    input.value = Math.max(1, parseInt(input.value || '1', 10) - 1);
+  });
+});
+</script>
+"""
+
+
+# ---------- REQUEST HANDLING ----------
+class Redirect(Exception):
+    def __init__(self, path):
+        self.path = path
+
+
+class ShopHandler(BaseHTTPRequestHandler):
+    server_version = "MinishopStandIn/1.0"
+
+    def log_message(self, format, *args):   # keep pytest output clean
+        pass
+
+    # -- plumbing --
+    def do_GET(self):
+        self._dispatch({})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        self._dispatch({k: v[-1] for k, v in parse_qs(body, keep_blank_values=True).items()})
+
+    def _dispatch(self, form):
+        url = urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        self.form = form
+        self._load_session()
+        if not url.path.startswith(APP_PREFIX):
+            return self._send(404, "text/plain", "Not Found")
+        route = url.path[len(APP_PREFIX):] or "index.php"
+        if route == "css/style.css":
+            return self._send(200, "text/css", STYLE)
+        view = ROUTES.get(route)
+        if view is None:
+            return self._send(404, "text/plain", "Not Found")
+        self.db = connect(self.server.db_path)
+        try:
+            body = view(self)
+        except Redirect as redirect:
+            self.send_response(302)
+            self.send_header("Location", APP_PREFIX + redirect.path)
+            self._send_cookie()
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        finally:
+            self.db.close()
+        self._send(200, "text/html; charset=utf-8", body)
+
+    def _send(self, status, content_type, text):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self._send_cookie()
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _load_session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        sid = cookie["PHPSESSID"].value if "PHPSESSID" in cookie else None
+        sessions = self.server.sessions
+        self.new_sid = None
+        if sid not in sessions:
+            # Like session_start(): unknown or missing id -> brand new session
+            sid = self.new_sid = secrets.token_hex(16)
+            sessions[sid] = {}
+        self.session = sessions[sid]
+
+    def _send_cookie(self):
+        if self.new_sid:
+            self.send_header("Set-Cookie", f"PHPSESSID={self.new_sid}; Path=/")
+
+    # -- helpers for views --
+    def require(self, role):
+        if self.session.get("role") != role:
+            raise Redirect("index.php")
+        return self.session["user_id"]
+
+    def one(self, sql, params=()):
+        return self.db.execute(sql, params).fetchone()
+
+    def all(self, sql, params=()):
+        return self.db.execute(sql, params).fetchall()
+
+
+# ---------- PUBLIC PAGES ----------
+def index_view(req):
+    error = ""
+    if req.command == "POST":
+        username = req.form.get("username", "").strip()
+        password = req.form.get("password", "")
+        if not username or not password:
+            error = "All fields are required."
+        else:
+            user = req.one("SELECT id, username, role FROM users WHERE username = ? AND password = MD5(?)",
+                           (username, password))
+            if user:
+                req.session.update(user_id=user[0], username=user[1], role=user[2])
+                raise Redirect("admin/admin_home.php" if user[2] == "admin" else "customer/customer_home.php")
+            error = "Invalid username or password."
+    return page("Login", f"""
+<div class='login-box'>
+  <h2>Mini Shop Login</h2>
+  {notice("error", error)}
+  <form method='post' action=''>
+    <input type='text' id='username' name='username' placeholder='Username'>
+    <input type='password' id='password' name='password' placeholder='Password'>
+    <button type='submit' class='login-btn' name='login'>Login</button>
+  </form>
+  <p><a href='signup.php'>Create an account</a></p>
+</div>""")
+
+
+def signup_view(req):
+    error = success = ""
+    if req.command == "POST":
+        username = req.form.get("username", "").strip()
+        password = req.form.get("password", "")
+        confirm = req.form.get("confirm", "")
+        if not username or not password:
+            error = "All fields are required."
+        elif password != confirm:
+            error = "Passwords do not match."
+        elif req.one("SELECT id FROM users WHERE username = ?", (username,)):
+            error = "Username already taken."
+        else:
+            req.db.execute("INSERT INTO users (username, password, role) VALUES (?, MD5(?), 'customer')",
+                           (username, password))
+            success = "Account created successfully. You can now log in."
+    return page("Sign Up", f"""
+<div class='signup-box'>
+  <h2>Create Account</h2>
+  {notice("error", error)}{notice("success", success)}
+  <form method='post' action=''>
+    <input type='text' id='username' name='username' placeholder='Username'>
+    <input type='password' id='password' name='password' placeholder='Password'>
+    <input type='password' id='confirm' name='confirm' placeholder='Confirm Password'>
+    <button type='submit' class='signup-btn' name='signup'>Sign Up</button>
+  </form>
+  <p><a href='index.php'>Back to login</a></p>
+</div>""")
+
+
+def logout_view(req):
+    req.session.clear()
+    raise Redirect("index.php")
+
+
+# ---------- CUSTOMER PAGES ----------
+def customer_home_view(req):
+    user_id = req.require("customer")
+    if req.command == "POST" and "add_to_cart" in req.form:
+        product_id = int(req.form["product_id"])
+        quantity = max(1, int(req.form.get("quantity") or 1))
+        line = req.one("SELECT id FROM cart WHERE user_id = ? AND product_id = ? AND bought = 'no'",
+                       (user_id, product_id))
+        if line:
+            req.db.execute("UPDATE cart SET quantity = ? WHERE id = ?", (quantity, line[0]))
+        else:
+            req.db.execute("INSERT INTO cart (user_id, product_id, quantity, bought) VALUES (?, ?, ?, 'no')",
+                           (user_id, product_id, quantity))
+        raise Redirect("customer/customer_home.php")
+
+    search = req.query.get("search", "").strip()
+    if search:
+        products = req.all("SELECT id, name, price, stock FROM products WHERE name LIKE ? ORDER BY id",
+                           (f"%{search}%",))
+    else:
+        products = req.all("SELECT id, name, price, stock FROM products ORDER BY id")
+    boxes = "".join(f"""
+  <div class='product-box'>
+    <h3>{esc(name)}</h3>
+    <p class='price'>{money(price)}</p>
+    <p class='stock'>In stock: {stock}</p>
+    <form method='post' action=''>
+      <input type='hidden' name='product_id' value='{pid}'>
+      <div class='qty-control'>
+        <button type='button' class='minus'>-</button>
+        <input type='number' class='qty-input' name='quantity' value='1' min='1'>
+        <button type='button' class='plus'>+</button>
+      </div>
+      <button type='submit' class='add-btn' name='add_to_cart'>Add to Cart</button>
+    </form>
+  </div>""" for pid, name, price, stock in products)
+    return page("Products", f"""
+<div class='header'>
+  <h2>Welcome, {esc(req.session['username'])}</h2>
+  <a href='cart.php'>Cart</a> <a href='../logout.php'>Logout</a>
+</div>
+<form method='get' action='' class='search-form'>
+  <input type='text' name='search' value='{esc(search)}' placeholder='Search products'>
+  <button type='submit' class='search-btn'>Search</button>
+</form>
+<div class='products'>{boxes or "<p>No products found.</p>"}</div>
+{QTY_SCRIPT}""", depth=1)
+
+
+def _cart_lines(req, user_id):
+    return req.all("""
+        SELECT p.id, p.name, p.price, c.quantity
+        FROM cart c JOIN products p ON c.product_id = p.id
+        WHERE c.user_id = ? AND c.bought = 'no' ORDER BY c.id""", (user_id,))
+
+
+def cart_view(req):
+    user_id = req.require("customer")
+    if req.command == "POST" and "update_cart" in req.form:
+        for key, value in req.form.items():
+            if key.startswith("quantities[") and key.endswith("]"):
+                product_id, quantity = int(key[len("quantities["):-1]), int(value or 0)
+                if quantity > 0:
+                    req.db.execute("UPDATE cart SET quantity = ? WHERE user_id = ? AND product_id = ? "
+                                   "AND bought = 'no'", (quantity, user_id, product_id))
+                else:
+                    req.db.execute("DELETE FROM cart WHERE user_id = ? AND product_id = ? AND bought = 'no'",
+                                   (user_id, product_id))
+        raise Redirect("customer/cart.php")
+
+    lines = _cart_lines(req, user_id)
+    if lines:
+        rows = "".join(f"""
+      <tr><td>{esc(name)}</td><td>{money(price)}</td>
+          <td><input type='number' name='quantities[{pid}]' value='{qty}' min='0'></td>
+          <td>{money(price * qty)}</td></tr>""" for pid, name, price, qty in lines)
+        total = sum(price * qty for _, _, price, qty in lines)
+        content = f"""
+  <form method='post' action=''>
+    <table>
+      <tr><th>Product</th><th>Price</th><th>Quantity</th><th>Subtotal</th></tr>{rows}
+    </table>
+    <button type='submit' name='update_cart' class='update-btn'>Update Cart</button>
+  </form>
+  <h3>Total Price: {money(total)}</h3>
+  <form method='get' action='pay.php'>
+    <button type='submit' name='pay_now' class='pay-btn'>Pay Now</button>
+  </form>"""
+    else:
+        content = "<p class='empty'>Your cart is empty.</p>"
+    return page("Cart", f"""
+<h2>Your Cart</h2>
+{content}
+<p><a href='customer_home.php'>Continue Shopping</a> <a href='../logout.php'>Logout</a></p>""", depth=1)
+
+
+def pay_view(req):
+    user_id = req.require("customer")
+    message = error = ""
+    if req.command == "POST" and "pay_now" in req.form:
+        req.db.execute("BEGIN IMMEDIATE")
+        try:
+            lines = req.all("""
+                SELECT c.id, p.id, p.name, c.quantity, p.stock
+                FROM cart c JOIN products p ON c.product_id = p.id
+                WHERE c.user_id = ? AND c.bought = 'no'""", (user_id,))
+            short = [name for _, _, name, qty, stock in lines if qty > stock]
+            if not lines:
+                error = "Your cart is empty."
+            elif short:
+                error = "Not enough stock for: " + ", ".join(short)
+            else:
+                for line_id, product_id, _, qty, _ in lines:
+                    req.db.execute("UPDATE products SET stock = stock - ? WHERE id = ?", (qty, product_id))
+                    req.db.execute("DELETE FROM cart WHERE id = ?", (line_id,))
+                message = f"You have successfully bought {sum(l[3] for l in lines)} item(s)!"
+            req.db.execute("COMMIT")
+        except Exception:
+            req.db.execute("ROLLBACK")
+            raise
+
+    lines = _cart_lines(req, user_id)
+    rows = "".join(f"<tr><td>{esc(name)}</td><td>{qty}</td><td>{money(price * qty)}</td></tr>"
+                   for _, name, price, qty in lines)
+    total = sum(price * qty for _, _, price, qty in lines)
+    return page("Payment", f"""
+<h2>Payment Summary</h2>
+{notice("message", message)}{notice("error", error)}
+<table><tr><th>Product</th><th>Quantity</th><th>Subtotal</th></tr>{rows}</table>
+<h3>Total Price: {money(total)}</h3>
+<form method='post' action=''>
+  <button type='submit' name='pay_now' class='pay-btn'>Pay Now</button>
+</form>
+<div class='back-btn'><a href='customer_home.php'>⬅ Back to Cart</a></div>""", depth=1)
+
+
+# ---------- ADMIN PAGES ----------
+def admin_home_view(req):
+    req.require("admin")
+    products = req.all("SELECT id, name, price, stock FROM products ORDER BY id")
+    rows = "".join(f"<tr><td>{pid}</td><td>{esc(name)}</td><td>{money(price)}</td><td>{stock}</td></tr>"
+                   for pid, name, price, stock in products)
+    return page("Admin", f"""
+<h2>Admin Dashboard</h2>
+<div class='cards'>
+  <div class='card'><a href='add_product.php'>Add Product</a></div>
+  <div class='card'><a href='delete_product.php'>Delete Products</a></div>
+  <div class='card'><a href='update_stock.php'>Update Stock</a></div>
+</div>
+<table>
+  <tr><th>ID</th><th>Product Name</th><th>Price (₹)</th><th>Stock</th></tr>{rows}
+</table>
+<p><a href='../index.php'>← Back to Index</a></p>""", depth=1)
+
+
+def add_product_view(req):
+    req.require("admin")
+    error = ""
+    if req.command == "POST":
+        name = req.form.get("name", "").strip()
+        price = req.form.get("price", "").strip()
+        stock = req.form.get("stock", "").strip()
+        if not name or not price or not stock:
+            error = "All fields are required."
+        elif req.one("SELECT id FROM products WHERE name = ?", (name,)):
+            error = "Product already exists!"
+        else:
+            req.db.execute("INSERT INTO products (name, price, stock) VALUES (?, ?, ?)",
+                           (name, int(float(price)), int(stock)))
+            raise Redirect("admin/admin_home.php")
+    return page("Add Product", f"""
+<h2 class='add-product-title'>Add New Product</h2>
+{notice("error", error)}
+<form method='post' action=''>
+  <input type='text' id='name' name='name' placeholder='Product name'>
+  <input type='number' id='price' name='price' placeholder='Price'>
+  <input type='number' id='stock' name='stock' placeholder='Stock'>
+  <button type='submit' class='add-btn' name='add_product'>Add Product</button>
+</form>
+<a href='admin_home.php'>⬅ Back</a>""", depth=1)
+
+
+def delete_product_view(req):
+    req.require("admin")
+    error = success = ""
+    if req.command == "POST":
+        product_id = req.form.get("product_id", "").strip()
+        if not product_id.isdigit():
+            error = "Please enter a valid product ID."
+        elif req.db.execute("DELETE FROM products WHERE id = ?", (int(product_id),)).rowcount:
+            req.db.execute("DELETE FROM cart WHERE product_id = ?", (int(product_id),))
+            success = "Product deleted successfully."
+        else:
+            error = "Product not found."
+    return page("Delete Product", f"""
+<h2>Delete Product</h2>
+{notice("error", error)}{notice("success", success)}
+<form method='post' action=''>
+  <input type='number' id='product_id' name='product_id' placeholder='Product ID'>
+  <button type='submit' class='delete-btn' name='delete_product'>Delete</button>
+</form>
+<a href='admin_home.php' class='back-btn'>⬅ Back</a>""", depth=1)
+
+
+def update_stock_view(req):
+    req.require("admin")
+    error = success = ""
+    product = None
+    product_id = req.form.get("product_id", "").strip()
+    if req.command == "POST":
+        if product_id.isdigit():
+            product = req.one("SELECT id, name, stock FROM products WHERE id = ?", (int(product_id),))
+        if not product:
+            error = "Product not found."
+        elif "update_stock" in req.form:
+            new_stock = req.form.get("new_stock", "").strip()
+            if new_stock.isdigit():
+                req.db.execute("UPDATE products SET stock = ? WHERE id = ?", (int(new_stock), product[0]))
+                success = "Stock updated successfully."
+                product = (product[0], product[1], int(new_stock))
+            else:
+                error = "Please enter a valid stock value."
+    details = ""
+    if product:
+        details = f"""
+  <p class='product-info'>{esc(product[1])} (current stock: {product[2]})</p>
+  <input type='number' id='new_stock' name='new_stock' placeholder='New stock'>
+  <button type='submit' name='update_stock' class='update-btn'>Update Stock</button>"""
+    return page("Update Stock", f"""
+<h2>Update Stock</h2>
+{notice("error", error)}{notice("success", success)}
+<form method='post' action=''>
+  <input type='number' id='product_id' name='product_id' value='{esc(product_id)}' placeholder='Product ID'>
+  <button type='submit' name='check_product' class='check-btn'>Check Product</button>{details}
+</form>
+<a href='admin_home.php' class='back-btn'>⬅ Back</a>""", depth=1)
+
+
+ROUTES = {
+    "index.php": index_view,
+    "signup.php": signup_view,
+    "logout.php": logout_view,
+    "customer/customer_home.php": customer_home_view,
+    "customer/cart.php": cart_view,
+    "customer/pay.php": pay_view,
+    "admin/admin_home.php": admin_home_view,
+    "admin/add_product.php": add_product_view,
+    "admin/delete_product.php": delete_product_view,
+    "admin/update_stock.php": update_stock_view,
+}
+
+
+# ---------- SERVER ----------
+class ShopServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128    # the default of 5 resets bursts of simultaneous clients
+
+
+class StandInShop:
+    """A running stand-in: base_url for the browser, db_path for the oracles."""
+
+    def __init__(self, port=0, db_path=None):
+        self._tmpdir = None
+        if db_path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="minishop-")
+            db_path = os.path.join(self._tmpdir.name, "mini_shop.sqlite3")
+        self.db_path = db_path
+        if not os.path.exists(db_path):
+            create_database(db_path)
+        self.httpd = ShopServer(("127.0.0.1", port), ShopHandler)
+        self.httpd.db_path = db_path
+        self.httpd.sessions = {}
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}{APP_PREFIX.rstrip('/')}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="minishop-standin", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    shop = StandInShop(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8080)
+    print(f"Serving minishop stand-in at {shop.base_url}/index.php (db: {shop.db_path})")
+    try:
+        shop.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,192 @@
+"""Per-command WebDriver latency, recorded when --webdriver-timing is given.
+
+Every WebDriver command - driver.get, find_element, execute_script, each
+send_keys, each property read on a WebElement - goes through
+driver.execute(). instrument() wraps that method on a driver so each command
+is recorded with its duration, the test that issued it and the locator, URL
+or script it was about. WebDriverWait.until/until_not are timed as one
+"wait.until" entry each (the polls inside show up as their own commands).
+
+A command is charged to the running test only when it is sent from the
+thread that runs the tests; Chrome launches and recycling on BrowserPool's
+background threads are booked as "<background>".
+
+At the end of the session write_report() stores per-command-type and
+per-test histograms as JSON, and summary() gives the lines for the terminal.
+Under xdist every worker writes its own file and hands its records to the
+controller (merge()), which writes the combined report to PATH:
+
+    pytest --webdriver-timing webdriver-timing.json
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from harness import workers
+
+BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+enabled = False
+records = []          # (nodeid, command, detail, seconds)
+merged = []           # xdist workers whose records were merged in
+_current_test = None
+_test_thread = None
+_lock = threading.Lock()
+_until = WebDriverWait.until
+_until_not = WebDriverWait.until_not
+
+
+def enable():
+    """Start recording; also times every WebDriverWait.until from now on."""
+    global enabled
+    enabled = True
+    WebDriverWait.until = _timed_wait(_until, "wait.until")
+    WebDriverWait.until_not = _timed_wait(_until_not, "wait.until_not")
+
+
+def begin_test(nodeid):
+    global _current_test, _test_thread
+    _current_test = nodeid
+    _test_thread = threading.get_ident()
+
+
+def end_test():
+    global _current_test
+    _current_test = None
+
+
+def record(command, detail, seconds):
+    if _test_thread is not None and threading.get_ident() != _test_thread:
+        nodeid = "<background>"
+    else:
+        nodeid = _current_test or "<outside tests>"
+    with _lock:
+        records.append((nodeid, command, detail, seconds))
+
+
+def merge(worker, rows):
+    """Add an xdist worker's records (from its workeroutput) on the controller."""
+    with _lock:
+        records.extend(tuple(row) for row in rows)
+        merged.append(worker)
+
+
+# ---------- INSTRUMENTATION ----------
+def _detail(command, params):
+    params = params or {}
+    if "url" in params:
+        return params["url"]
+    if "using" in params:
+        return f"{params['using']}={params.get('value')}"
+    if "script" in params:
+        return " ".join(params["script"].split())[:80]
+    if "text" in params:
+        return f"{len(params['text'])} chars"
+    return ""
+
+
+def instrument(driver):
+    """Time every command this driver sends; a no-op unless enabled."""
+    if not enabled or getattr(driver, "_timed", False):
+        return driver
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            record(driver_command, _detail(driver_command, params), time.perf_counter() - started)
+
+    driver.execute = timed_execute
+    driver._timed = True
+    return driver
+
+
+def _timed_wait(until, name):
+    def timed(self, method, message=""):
+        started = time.perf_counter()
+        try:
+            return until(self, method, message)
+        finally:
+            record(name, getattr(method, "__name__", type(method).__name__), time.perf_counter() - started)
+    return timed
+
+
+# ---------- REPORTING ----------
+def histogram(durations):
+    """count/total/percentiles in milliseconds plus counts per latency bucket."""
+    ms = sorted(seconds * 1000 for seconds in durations)
+    if not ms:
+        return {"count": 0}
+
+    def percentile(p):
+        return round(ms[min(len(ms) - 1, int(p / 100 * len(ms)))], 2)
+
+    buckets = defaultdict(int)
+    for value in ms:
+        label = next((f"<{bound}ms" for bound in BUCKETS_MS if value < bound), f">={BUCKETS_MS[-1]}ms")
+        buckets[label] += 1
+    return {
+        "count": len(ms),
+        "total_ms": round(sum(ms), 2),
+        "mean_ms": round(sum(ms) / len(ms), 2),
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": round(ms[-1], 2),
+        "buckets": dict(buckets),
+    }
+
+
+def build_report():
+    by_command = defaultdict(list)
+    by_test = defaultdict(lambda: defaultdict(list))
+    for nodeid, command, _, seconds in records:
+        by_command[command].append(seconds)
+        by_test[nodeid][command].append(seconds)
+    tests = {}
+    for nodeid, commands in by_test.items():
+        durations = [seconds for values in commands.values() for seconds in values]
+        tests[nodeid] = dict(histogram(durations),
+                             commands={command: histogram(values) for command, values in commands.items()})
+    return {
+        "worker": workers.WORKER_ID,
+        "merged_workers": sorted(merged),
+        "commands": {command: histogram(values) for command, values in by_command.items()},
+        "tests": tests,
+    }
+
+
+def write_report(path):
+    """Write the JSON report; each xdist worker gets its own file next to `path`."""
+    if workers.is_parallel():
+        stem, dot, ext = path.rpartition(".")
+        path = f"{stem}.{workers.WORKER_ID}.{ext}" if dot else f"{path}.{workers.WORKER_ID}"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_report(), f, indent=2)
+    return path
+
+
+def summary(limit=10):
+    """Lines for the terminal: slowest command types and the chattiest tests."""
+    if not records:
+        return []
+    report = build_report()
+    total = sum(entry["total_ms"] for entry in report["commands"].values()) / 1000
+    lines = [f"{len(records)} WebDriver commands, {total:.1f}s in total"]
+    lines.append("by command (count, total, p50, p90):")
+    commands = sorted(report["commands"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+    for command, entry in commands[:limit]:
+        lines.append(f"  {command:<28} {entry['count']:6d} {entry['total_ms'] / 1000:8.2f}s "
+                     f"{entry['p50_ms']:8.1f}ms {entry['p90_ms']:8.1f}ms")
+    lines.append("by test (commands, total, most frequent command):")
+    tests = sorted(report["tests"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+    for nodeid, entry in tests[:limit]:
+        command, most = max(entry["commands"].items(), key=lambda kv: kv[1]["count"])
+        lines.append(f"  {entry['count']:5d} {entry['total_ms'] / 1000:8.2f}s  {nodeid}  "
+                     f"({most['count']}x {command})")
+    return lines
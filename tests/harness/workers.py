@@ -0,0 +1,37 @@
+"""Per-worker namespaces so several pytest processes can share one shop.
+
+Under pytest-xdist every worker is a separate process; two of them creating
+"TestProduct_<current second>" collide, and two of them paying for the same
+customer's cart break each other. Names built here are unique per run, per
+worker and per call, and each worker gets its own customer and product (see
+the shop_customer / shop_product fixtures in conftest.py).
+
+    pytest -n 4 --dist loadscope
+
+Tests no longer hand data to each other through class attributes (they
+declare it with @pytest.mark.needs, see harness/prereqs.py), so any --dist
+mode works and any single test can run on its own.
+"""
+import itertools
+import os
+import uuid
+
+# Same value in every worker of one xdist run, fresh for every run
+RUN_TOKEN = os.environ.get("PYTEST_XDIST_TESTRUNUID", uuid.uuid4().hex)[:6]
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+_counter = itertools.count(1)
+
+
+def is_parallel():
+    return "PYTEST_XDIST_WORKER" in os.environ
+
+
+def namespace():
+    """Prefix shared by everything this process creates, e.g. "a1b2c3gw0"."""
+    return f"{RUN_TOKEN}{WORKER_ID}"
+
+
+def unique_name(prefix):
+    """Collision-free name across processes and calls, e.g. "TestProduct_a1b2c3gw0_7"."""
+    return f"{prefix}_{namespace()}_{next(_counter)}"
@@ -0,0 +1,20 @@
+"""How harness/contention.py starts its actors (the scenario itself is test_http_contention.py)."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from harness import contention
+
+
+def test_contention_names_the_actor_that_failed_before_the_start():
+    start = threading.Barrier(2)
+
+    def actor():
+        start.abort()
+        raise ValueError("pay.php unreachable")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        jobs = [executor.submit(actor)]
+        with pytest.raises(RuntimeError, match="pay.php unreachable"):
+            contention._release(start, jobs)
@@ -0,0 +1,20 @@
+"""Connection pool of harness/db.py, against the stand-in's SQLite file."""
+import sqlite3
+
+import pytest
+
+from harness.db import SQLiteDatabase
+
+
+def test_failed_statements_give_their_connection_back(standin):
+    database = SQLiteDatabase(standin.db_path, size=2)
+    try:
+        database.create_user("pool_dup", "pw")
+        for _ in range(database.size + 2):
+            with pytest.raises(sqlite3.IntegrityError):
+                database.create_user("pool_dup", "pw")
+        assert database.get_user_id("pool_dup")
+        assert database._idle.qsize() == database._opened
+    finally:
+        database.delete_user("pool_dup")
+        database.close()
@@ -0,0 +1,27 @@
+"""Bulk rows from harness/factory.py, against the stand-in."""
+import pytest
+
+from harness.factory import DataFactory
+
+
+def test_factory_scenario_and_cleanup(standin_db):
+    factory = DataFactory(standin_db)
+    scenario = factory.scenario("customer_with_50_line_cart")
+    assert len(scenario.cart) == 50
+    assert len(standin_db.get_cart_items(scenario.customer.id)) == 50
+
+    factory.cleanup()
+    assert standin_db.get_user_id(scenario.customer.username) is None
+    assert standin_db.get_cart_items(scenario.customer.id) == []
+
+
+def test_factory_forgets_ids_of_a_rolled_back_scenario(standin_db, monkeypatch):
+    factory = DataFactory(standin_db)
+
+    def fail(*args):
+        raise RuntimeError("cart insert failed")
+
+    monkeypatch.setattr(factory, "_insert_cart", fail)
+    with pytest.raises(RuntimeError):
+        factory.scenario("customer_with_cart")
+    assert (factory.user_ids, factory.product_ids, factory.cart_ids) == ([], [], [])
@@ -0,0 +1,72 @@
+"""Flake history scores (harness/flakes.py) and the reruns conftest.py builds on them."""
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from harness import flakes
+
+
+def test_flake_history_scores_flips_not_failures(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    history = flakes.FlakeHistory(path)
+    runs = {"t.py::flaky": [True] * 9 + [False] + [True] * 10, "t.py::broken": [True] * 10 + [False] * 10}
+    for nodeid, outcomes in runs.items():
+        for passed in outcomes:
+            history.add_report(SimpleNamespace(nodeid=nodeid, when="teardown", duration=1.0, skipped=False,
+                                               failed=not passed, outcome="passed" if passed else "failed"))
+    assert history.classify() == (["t.py::flaky"], ["t.py::broken"])
+    history.save()
+
+    reloaded = flakes.FlakeHistory(path)
+    assert reloaded.is_flaky("t.py::flaky")
+    assert not reloaded.is_flaky("t.py::broken")
+    assert not reloaded.is_flaky("t.py::never_seen")
+
+
+def test_known_flaky_failures_are_rerun_at_the_end(suite):
+    suite.makepyfile(test_flow="""
+        import os
+
+        def test_flaky():
+            # Fails on every other attempt
+            seen = os.path.exists("attempted")
+            if seen:
+                os.remove("attempted")
+            else:
+                open("attempted", "w").close()
+            assert seen
+
+        def test_broken():
+            assert False
+    """)
+    path = str(suite.path / "history.sqlite")
+    history = flakes.FlakeHistory(path)
+    for nodeid in ("test_flow.py::test_flaky", "test_flow.py::test_broken"):
+        for passed in [True, False] * 5:
+            history.add_report(SimpleNamespace(nodeid=nodeid, when="teardown", duration=0.1, skipped=False,
+                                               failed=not passed, outcome="passed" if passed else "failed"))
+    history.save()
+
+    result = suite.runpytest_subprocess("-v", f"--flake-history={path}", "-p", "no:cacheprovider")
+    result.stdout.fnmatch_lines([
+        "test_flow.py::test_flaky RERUN*",
+        "test_flow.py::test_broken RERUN*",
+        "test_flow.py::test_flaky PASSED*",
+        "test_flow.py::test_broken FAILED*",
+        "*flaky or broken*",
+        "flaky (passed on rerun): 1",
+        "  test_flow.py::test_flaky  [[]FP]  known-flaky*",
+        "broken: 1",
+        "  test_flow.py::test_broken  [[]FF]  known-flaky*",
+    ])
+    assert result.ret == pytest.ExitCode.TESTS_FAILED
+    with sqlite3.connect(path) as conn:
+        attempts = conn.execute("SELECT attempt, passed FROM attempts WHERE nodeid = ? ORDER BY id DESC LIMIT 2",
+                                ("test_flow.py::test_flaky",)).fetchall()
+    assert attempts == [(2, 1), (1, 0)]
+
+    # Only the flaky one: rescued by its rerun, so the run passes
+    result = suite.runpytest_subprocess("-v", f"--flake-history={path}", "-p", "no:cacheprovider", "-k", "flaky")
+    result.stdout.fnmatch_lines(["test_flow.py::test_flaky RERUN*", "test_flow.py::test_flaky PASSED*"])
+    assert result.ret == pytest.ExitCode.OK
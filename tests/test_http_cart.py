@@ -0,0 +1,51 @@
+"""cart.php over plain HTTP: the same DB checks as test_cart.py, without Chrome."""
+from harness.db import CART_ITEMS_SQL
+
+CART_PAGE = "customer/cart.php"
+
+
+def parse_currency(text):
+    """Extract the amount from text like 'Total Price: ₹1,500'."""
+    return float(text.split("₹")[1].replace(",", "").strip())
+
+
+# ---------- TESTS ----------
+class TestCartPageHttp:
+
+    def test_cart_page_loads(self, customer_http):
+        page = customer_http.get(CART_PAGE)
+        assert "Your Cart" in page.html
+
+    def test_cart_items_displayed(self, customer_http, db, shop_customer):
+        db.seed_cart_if_empty(shop_customer.id)
+        page = customer_http.get(CART_PAGE)
+        rows = page.find_all("tr")
+        print(f"📌 Found {len(rows)-1} cart item rows.")
+        assert len(rows) - 1 == len(db.get_cart_items(shop_customer.id))
+
+    def test_update_quantity_and_db_sync(self, customer_http, db, shop_customer):
+        db.seed_cart_if_empty(shop_customer.id)
+        product_id, old_qty, name, _ = db.get_cart_items(shop_customer.id)[0]
+        new_qty = old_qty + 1
+
+        page = customer_http.get(CART_PAGE)
+        form = page.form(button="update_cart", field=f"quantities[{product_id}]")
+        customer_http.submit(form, "update_cart", {f"quantities[{product_id}]": str(new_qty)})
+
+        db.wait_for(CART_ITEMS_SQL, (shop_customer.id,),
+                    lambda rows: any(row[0] == product_id and row[1] == new_qty for row in rows))
+        print(f"✅ {name}: quantity {old_qty} -> {new_qty}")
+
+    def test_total_price_matches_db(self, customer_http, db, shop_customer):
+        db.seed_cart_if_empty(shop_customer.id)
+        page = customer_http.get(CART_PAGE)
+        db_total = sum(price * qty for _, qty, _, price in db.get_cart_items(shop_customer.id))
+        ui_total = parse_currency(page.text_of("h3"))
+        print(f"📌 DB total: ₹{db_total}, UI total: ₹{ui_total}")
+        assert ui_total == db_total
+
+    def test_pay_now_leads_to_payment_page(self, customer_http, db, shop_customer):
+        db.seed_cart_if_empty(shop_customer.id)
+        page = customer_http.get(CART_PAGE)
+        payment = customer_http.submit(page.form(button="pay_now"), "pay_now")
+        assert "Payment Summary" in payment.html
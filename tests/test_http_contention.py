@@ -0,0 +1,30 @@
+"""pay.php and update_stock.php under contention on one low-stock product (see harness/contention.py)."""
+import pytest
+
+from harness import contention
+
+
+def run_scenario(db, **kwargs):
+    stats, problems = contention.run(db, **kwargs)
+    print("\n".join(stats.report()))
+    return stats, problems
+
+
+# ---------- TESTS ----------
+class TestCheckoutContention:
+
+    def test_parallel_checkout_never_oversells(self, db):
+        stats, problems = run_scenario(db, customers=20, admins=0, stock=5)
+
+        assert problems == [], "⚠️ " + "; ".join(problems)
+        assert stats.outcomes["error"] == 0, stats.errors
+        assert stats.outcomes["bought"] == 5, f"⚠️ Expected all 5 units sold, got {dict(stats.outcomes)}"
+
+    # Known defect: update_stock.php writes back an absolute value read before concurrent
+    # purchases commit, so their decrements are lost - when the requests happen to interleave
+    @pytest.mark.xfail(reason="update_stock.php lost update", strict=False)
+    def test_stock_edits_during_checkout_keep_stock_consistent(self, db):
+        stats, problems = run_scenario(db, customers=20, admins=2, stock=5, rounds=5)
+
+        assert stats.outcomes["error"] == 0, stats.errors
+        assert problems == [], "⚠️ " + "; ".join(problems)
@@ -0,0 +1,37 @@
+"""delete_product.php over plain HTTP: the same DB checks as test_delete_product.py."""
+import pytest
+
+DELETE_PAGE = "admin/delete_product.php"
+
+
+def delete_product(client, product_id):
+    page = client.get(DELETE_PAGE)
+    return client.submit(page.form(field="product_id"), "delete_product", {"product_id": str(product_id)})
+
+
+# ---------- TESTS ----------
+class TestDeleteProductHttp:
+
+    def test_delete_existing_product(self, admin_http, db, factory):
+        product = factory.product(price=456, stock=20, prefix="DeleteTest")
+
+        delete_product(admin_http, product.id)
+
+        try:
+            db.wait_for("SELECT id FROM products WHERE id=%s", (product.id,), lambda rows: not rows)
+        except AssertionError as exc:
+            pytest.fail(f"⚠️ Product with ID {product.id} still exists in DB\n{exc}")
+        print(f"✅ Product ID {product.id} successfully deleted from DB")
+
+    def test_delete_nonexistent_product(self, admin_http, db):
+        fake_id = "999999"
+        count_before = db.query_one("SELECT COUNT(*) FROM products")[0]
+
+        delete_product(admin_http, fake_id)
+
+        assert db.query_one("SELECT id FROM products WHERE id=%s", (fake_id,)) is None
+        assert db.query_one("SELECT COUNT(*) FROM products")[0] == count_before
+
+    def test_back_link(self, admin_http):
+        page = admin_http.get(DELETE_PAGE)
+        assert page.find("a", class_="back-btn").attrs["href"].endswith("admin_home.php")
@@ -0,0 +1,57 @@
+"""pay.php over plain HTTP: the same DB checks as test_pay.py, without Chrome."""
+PAY_PAGE = "customer/pay.php"
+
+# ---------- DB QUERIES ----------
+# Payment summary lines, bought or not: after paying there should be none at all
+CART_ITEMS_SQL = """
+    SELECT p.id, p.name, p.price, c.quantity, p.stock
+    FROM cart c
+    JOIN products p ON c.product_id = p.id
+    WHERE c.user_id = %s
+"""
+
+
+def parse_currency(text):
+    """Extract float value from currency string like '₹122,000.00'."""
+    return float(text.replace("₹", "").replace(",", "").strip())
+
+
+# ---------- TESTS ----------
+class TestPaymentPageHttp:
+
+    def test_payment_page_loads(self, customer_http):
+        page = customer_http.get(PAY_PAGE)
+        assert "Payment Summary" in page.html
+
+    def test_cart_summary_matches_db(self, customer_http, db, shop_customer):
+        db.seed_cart_if_empty(shop_customer.id)
+        page = customer_http.get(PAY_PAGE)
+
+        cart_items_db = db.query(CART_ITEMS_SQL, (shop_customer.id,))
+        db_total = sum(price * qty for _, _, price, qty, _ in cart_items_db)
+        ui_total = parse_currency(page.text_of("h3").split("₹")[1])
+
+        print(f"📌 DB total: {db_total}, UI total: {ui_total}")
+        assert round(ui_total, 2) == round(db_total, 2)
+
+    def test_pay_now_purchase_flow(self, customer_http, db, shop_customer):
+        db.seed_cart_if_empty(shop_customer.id)
+        cart_items_before = db.query(CART_ITEMS_SQL, (shop_customer.id,))
+        assert cart_items_before, "⚠️ Cart is still empty after seeding."
+
+        page = customer_http.get(PAY_PAGE)
+        result = customer_http.submit(page.form(button="pay_now"), "pay_now")
+
+        db.wait_for(CART_ITEMS_SQL, (shop_customer.id,), lambda rows: not rows)
+        for product_id, name, _, qty, stock in cart_items_before:
+            db.wait_for("SELECT stock FROM products WHERE id=%s", (product_id,),
+                        lambda rows, expected=stock - qty: rows[0][0] == expected)
+
+        success_msg = result.text_of(class_="message")
+        print(f"📌 Success message: {success_msg}")
+        assert "successfully bought" in success_msg.lower()
+
+    def test_back_to_cart_link(self, customer_http):
+        page = customer_http.get(PAY_PAGE)
+        link = page.find("div", class_="back-btn").find("a")
+        assert link.attrs["href"].endswith("customer_home.php")
@@ -0,0 +1,56 @@
+"""signup.php over plain HTTP: the same checks as test_signup.py, without Chrome."""
+import pytest
+
+from harness.workers import unique_name
+
+SIGNUP_PAGE = "signup.php"
+PASSWORD = "TestPass123"
+
+
+def sign_up(client, username, password, confirm=None):
+    page = client.get(SIGNUP_PAGE)
+    form = page.form(button="signup")
+    return client.submit(form, "signup", {
+        "username": username,
+        "password": password,
+        "confirm": password if confirm is None else confirm,
+    })
+
+
+@pytest.fixture
+def cleanup_user(db):
+    created_users = []
+    yield created_users
+    for username in created_users:
+        db.delete_user(username)
+
+
+# ---------- TESTS ----------
+def test_unique_signup(http_client, db, cleanup_user):
+    username = unique_name("user")
+    cleanup_user.append(username)
+
+    page = sign_up(http_client, username, PASSWORD)
+
+    assert "Account created successfully" in page.text_of(class_="success")
+    assert db.get_user_id(username), f"⚠️ {username} was not written to the DB"
+
+
+def test_duplicate_signup(http_client, db, cleanup_user):
+    username = unique_name("fixed_test_user")
+    cleanup_user.append(username)
+
+    sign_up(http_client, username, PASSWORD)
+    page = sign_up(http_client, username, PASSWORD)
+
+    assert "Username already taken" in page.text_of(class_="error")
+    assert len(db.query("SELECT id FROM users WHERE username = %s", (username,))) == 1
+
+
+def test_password_mismatch(http_client, db):
+    username = unique_name("user_mismatch")
+
+    page = sign_up(http_client, username, "password123", confirm="differentpass")
+
+    assert "Passwords do not match" in page.text_of(class_="error")
+    assert db.get_user_id(username) is None
@@ -0,0 +1,44 @@
+"""update_stock.php over plain HTTP: the same DB checks as test_update_product.py."""
+import pytest
+
+STOCK_PAGE = "admin/update_stock.php"
+
+
+def check_product(client, product_id):
+    page = client.get(STOCK_PAGE)
+    return client.submit(page.form(field="product_id"), "check_product", {"product_id": str(product_id)})
+
+
+# ---------- TESTS ----------
+class TestUpdateStockHttp:
+
+    def test_reduce_existing_product_stock(self, admin_http, db, factory):
+        product = factory.product(price=789, stock=20, prefix="StockTest")
+        new_stock = max(0, product.stock - 5)
+
+        # Step 1: find the product, which reveals the new_stock field
+        page = check_product(admin_http, product.id)
+        form = page.form(button="update_stock")
+        assert "new_stock" in form.fields, "⚠️ Product lookup did not show the stock form"
+
+        # Step 2: submit the reduced stock
+        admin_http.submit(form, "update_stock", {"new_stock": str(new_stock)})
+
+        try:
+            db.wait_for("SELECT stock FROM products WHERE id=%s", (product.id,),
+                        lambda rows: bool(rows) and int(rows[0][0]) == new_stock)
+        except AssertionError as exc:
+            pytest.fail(f"⚠️ Stock not reduced in DB. Expected {new_stock}\n{exc}")
+        print(f"✅ Stock for product ID {product.id} reduced to {new_stock} in DB")
+
+    def test_update_nonexistent_product_stock(self, admin_http, db):
+        fake_id = "999999"
+
+        page = check_product(admin_http, fake_id)
+
+        assert page.find(id="new_stock") is None, "⚠️ Stock form shown for a missing product"
+        assert db.query_one("SELECT id FROM products WHERE id=%s", (fake_id,)) is None
+
+    def test_back_link(self, admin_http):
+        page = admin_http.get(STOCK_PAGE)
+        assert page.find("a", class_="back-btn").attrs["href"].endswith("admin_home.php")
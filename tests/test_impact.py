@@ -0,0 +1,10 @@
+"""Page fingerprints of harness/impact.py, against the stand-in."""
+from harness import impact
+
+
+def test_logged_out_fingerprints_never_vouch_for_protected_pages(standin):
+    assert impact.page_fingerprint("signup.php") is not None
+    assert impact.page_fingerprint("customer/cart.php") is None    # only the login form was seen
+    entry = {"pages": ["customer/cart.php"], "tables": [], "passed": True, "test_hash": "t",
+             "fingerprints": {"customer/cart.php": None}}
+    assert not impact.unchanged(entry, "t", {"customer/cart.php": None})
@@ -0,0 +1,10 @@
+"""The HTTP load generator of harness/load.py, on a short run against the stand-in."""
+import pytest
+
+
+def test_load_run_keeps_cart_and_stock_consistent(standin_db):
+    load = pytest.importorskip("harness.load", exc_type=ImportError)
+    stats, problems = load.run(standin_db, users=4, rate=20, duration=1, products=2, stock=15, seed=7)
+    assert problems == []
+    assert stats.journeys["failed"] == 0, stats.failures
+    assert stats.journeys["completed"] > 0
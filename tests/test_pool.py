@@ -0,0 +1,107 @@
+"""Browser pool sizing and in-place reset (harness/pool.py, harness/browser.py) on a fake Chrome."""
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from harness import browser, settings
+from harness.pool import BrowserPool
+
+
+class FakeChrome:
+    """Just enough of a Chrome WebDriver for browser.reset: tabs with a history, and a log of what was done."""
+
+    def __init__(self, tabs, fail_on=None):
+        self.tabs = dict(tabs)    # handle -> [url, ...] of its history
+        self.current = next(iter(self.tabs))
+        self.log = []
+        self.fail_on = fail_on
+        self.switch_to = SimpleNamespace(window=self._switch, new_window=self._new_window)
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def _switch(self, handle):
+        if handle not in self.tabs:
+            raise RuntimeError(f"no such window {handle}")
+        self.current = handle
+
+    def _new_window(self, kind):
+        self.current = f"tab{len(self.log)}"
+        self.tabs[self.current] = ["about:blank"]
+        self.log.append(("new_window", kind))
+
+    def close(self):
+        self.log.append(("close", self.current))
+        del self.tabs[self.current]
+
+    def execute_cdp_cmd(self, command, params):
+        if command == self.fail_on:
+            raise RuntimeError(f"{command} failed")
+        if command == "Page.getNavigationHistory":
+            return {"entries": [{"id": index, "url": url} for index, url in enumerate(self.tabs[self.current])]}
+        self.log.append((command, params.get("origin")))
+        return {}
+
+
+def test_reset_replaces_the_tabs_before_clearing_their_origins(standin):
+    chrome = FakeChrome({"shop": [settings.shop_url("index.php"), "https://todo.example/app"],
+                         "other": ["http://other.test/page", "about:blank"]})
+    browser.reset(chrome)
+
+    fresh, = chrome.window_handles
+    assert chrome.current == fresh
+    assert chrome.log == [
+        ("new_window", "tab"),
+        ("close", "shop"),
+        ("close", "other"),
+        ("Network.clearBrowserCookies", None),
+        ("Network.clearBrowserCache", None),
+    ] + [("Storage.clearDataForOrigin", origin)
+         for origin in sorted({browser._origin(standin.base_url), "https://todo.example", "http://other.test"})]
+
+
+def test_pool_discards_a_browser_reset_could_not_clean():
+    chrome = FakeChrome({"shop": ["about:blank"]}, fail_on="Network.clearBrowserCookies")
+    with pytest.raises(RuntimeError):
+        browser.reset(chrome)
+    assert BrowserPool._recycle(chrome) is False
+
+
+def settle(pool):
+    """Wait for the background launches and quits the pool has queued so far."""
+    idle = threading.Barrier(pool.size)    # every executor thread has to be free to pass it
+    for done in [pool._executor.submit(idle.wait) for _ in range(pool.size)]:
+        done.result()
+
+
+def test_pool_keeps_size_browsers_counting_the_leased_ones():
+    launched = []
+
+    def launch():
+        chrome = FakeChrome({"blank": ["about:blank"]})
+        chrome.quit = lambda: launched.remove(chrome)
+        launched.append(chrome)
+        return chrome
+
+    pool = BrowserPool(size=2, launch=launch)
+    try:
+        for _ in range(5):
+            first, second = pool.lease(), pool.lease()
+            pool.release(first)
+            pool.release(second)
+        settle(pool)
+        assert len(launched) == 2
+        # Three at once is one more than size: the extra one is quit when it comes back
+        leases = [pool.lease() for _ in range(3)]
+        for chrome in leases:
+            pool.release(chrome)
+        settle(pool)
+        assert len(launched) == 2
+    finally:
+        pool.close()
@@ -0,0 +1,15 @@
+"""Shared and fresh prerequisites of harness/prereqs.py, against the stand-in."""
+from harness.factory import DataFactory
+from harness.prereqs import Prerequisites
+
+
+def test_prerequisites_are_shared_unless_fresh(standin_db):
+    factory = DataFactory(standin_db)
+    prerequisites = Prerequisites(factory)
+    shared = prerequisites.build("product", stock=20, prefix="Needed")
+    assert prerequisites.build("product", stock=20, prefix="Needed") is shared
+    fresh = prerequisites.build("product", stock=20, prefix="Needed", fresh=True)
+    assert fresh.id != shared.id and fresh.stock == 20
+
+    factory.cleanup()
+    assert standin_db.query_one("SELECT id FROM products WHERE id = %s", (fresh.id,)) is None
@@ -0,0 +1,35 @@
+"""Duration-balanced shards (harness/schedule.py, --shard)."""
+from types import SimpleNamespace
+
+import pytest
+
+from harness import schedule
+
+
+def test_split_is_longest_first_and_keeps_roles_together():
+    def item(nodeid, *fixtures):
+        return SimpleNamespace(nodeid=nodeid, fixturenames=list(fixtures), get_closest_marker=lambda name: None)
+
+    items = [item("a.py::admin_1", "login_admin"), item("a.py::admin_2", "login_admin"),
+             item("b.py::long"), item("c.py::short_1"), item("c.py::short_2")]
+    seconds = {"a.py::admin_1": 10, "a.py::admin_2": 10, "b.py::long": 15, "c.py::short_1": 3, "c.py::short_2": 2}
+    bins, loads = schedule.split(items, 2, seconds.get)
+    assert [[each.nodeid for each in share] for share in bins] == [
+        ["a.py::admin_1", "a.py::admin_2"], ["b.py::long", "c.py::short_1", "c.py::short_2"]]
+    assert loads == [20, 20]
+
+
+def test_shards_under_xdist_report_each_test_once(suite):
+    suite.makepyfile(test_few="""
+        import pytest
+
+        @pytest.mark.parametrize("n", range(3))
+        def test_number(n):
+            pass
+    """)
+    # More workers than tests: some get nothing, which must not fail the run
+    result = suite.runpytest_subprocess("-n", "4", "--shard", "1/2", "-p", "no:cacheprovider")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["*[[]100%]"])
+    result.stdout.no_fnmatch_line("*[[][2-9][0-9][0-9]%]*")    # each test counted by every worker
+    assert result.ret == pytest.ExitCode.OK
@@ -0,0 +1,44 @@
+"""Database snapshot and restore (harness/db.py, --db-restore), against the stand-in."""
+from harness.factory import DataFactory
+
+
+def test_snapshot_restore_undoes_inserts_and_edits(standin_db):
+    factory = DataFactory(standin_db)
+    kept = factory.product(stock=5, prefix="Snapshot")
+    standin_db.snapshot()
+    try:
+        added = factory.product(stock=1, prefix="Snapshot")
+        standin_db.execute("UPDATE products SET stock = 0 WHERE id = %s", (kept.id,))
+        standin_db.restore()
+        assert standin_db.query_one("SELECT id FROM products WHERE id = %s", (added.id,)) is None
+        assert standin_db.query_one("SELECT stock FROM products WHERE id = %s", (kept.id,))[0] == 5
+    finally:
+        standin_db.drop_snapshot()
+        factory.cleanup()
+
+
+def test_module_restore_keeps_session_data_built_mid_module(suite):
+    suite.makepyfile(test_a="""
+        import pytest
+
+        def test_first(db, pytestconfig):
+            assert pytestconfig.db_restore == "module" and pytestconfig.snapshot_taken
+            db.execute("INSERT INTO products (name, price, stock) VALUES ('Leaked', 1, 1)")
+
+        @pytest.mark.needs("product", stock=3)
+        def test_second(db, shop_customer, needs):
+            assert db.get_user_id(shop_customer.username)
+    """, test_b="""
+        import pytest
+
+        @pytest.mark.needs("product", stock=3)
+        def test_later(db, shop_customer, needs):
+            assert db.get_user_id(shop_customer.username)
+            assert db.query_one("SELECT id FROM products WHERE id = %s", (needs.product.id,))
+
+        def test_module_rows_are_gone(db):
+            assert db.query_one("SELECT id FROM products WHERE name = 'Leaked'") is None
+    """)
+    result = suite.runpytest_subprocess("--standin", "--db-restore=module", "--isolated-data",
+                                        "-p", "no:cacheprovider")
+    result.assert_outcomes(passed=4)
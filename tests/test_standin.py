@@ -0,0 +1,41 @@
+"""Checks for the stand-in shop itself: pages, sessions and its database (no browser needed)."""
+import pytest
+import requests
+
+from harness import settings
+from harness.browser import http_login
+
+
+def test_pages_are_served(standin):
+    for page in ("index.php", "signup.php"):
+        response = requests.get(f"{standin.base_url}/{page}", timeout=5)
+        assert response.status_code == 200
+        assert "Mini Shop" in response.text
+    assert "PHPSESSID" in response.cookies
+
+
+def test_protected_pages_redirect_to_login(standin):
+    response = requests.get(f"{standin.base_url}/customer/cart.php", timeout=5)
+    assert response.url.endswith("/index.php")
+
+
+@pytest.mark.parametrize("role,username,password", [
+    ("admin", settings.ADMIN_USER, settings.ADMIN_PASSWORD),
+    ("customer", settings.CUSTOMER_USER, settings.CUSTOMER_PASSWORD),
+])
+def test_http_login_returns_session(standin, role, username, password):
+    session_id = http_login(role, username, password)
+    home = requests.get(settings.shop_url(settings.HOME_PAGES[role]),
+                        cookies={"PHPSESSID": session_id}, timeout=5)
+    assert settings.HOME_PAGES[role] in home.url
+
+
+def test_http_login_rejects_wrong_password(standin):
+    with pytest.raises(RuntimeError, match="ended on"):
+        http_login("customer", settings.CUSTOMER_USER, "wrong-password")
+
+
+def test_wait_for_times_out_with_rows(standin_db):
+    with pytest.raises(AssertionError, match="rows never changed"):
+        standin_db.wait_for("SELECT id FROM users WHERE username = %s", (settings.ADMIN_USER,),
+                            lambda rows: not rows, timeout=0.2)
@@ -1,24 +1,23 @@
-import time
 import uuid
 import pytest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
+from harness import pacing
+
 @pytest.fixture
-def driver():
-    options = webdriver.ChromeOptions()
-    #options.add_argument("--headless")  # Remove this line to see the browser
-    driver = webdriver.Chrome(options=options)
+def driver(browser_pool):
+    driver = browser_pool.lease()  # --headless to hide the browser
     yield driver
-    driver.quit()
+    browser_pool.release(driver)
 
 def wait_and_click(driver, by, value, timeout=10):
     wait = WebDriverWait(driver, timeout)
     element = wait.until(EC.element_to_be_clickable((by, value)))
     driver.execute_script("arguments[0].scrollIntoView(true);", element)
     driver.execute_script("arguments[0].click();", element)
+    return element
 
 def test_todo_app(driver):
     base_url = "http://localhost/todo-app/public/index.php"
@@ -31,12 +30,12 @@ def test_todo_app(driver):
     # Add a new task
     wait.until(EC.presence_of_element_located((By.NAME, "title"))).send_keys(unique_task)
     Select(driver.find_element(By.NAME, "category")).select_by_value(category)
-    wait_and_click(driver, By.CSS_SELECTOR, "button[type='submit']")
-    time.sleep(1)
+    submit = wait_and_click(driver, By.CSS_SELECTOR, "button[type='submit']")
+    wait.until(EC.staleness_of(submit))  # the form has been posted and the page reloaded
 
     # Navigate to category tab
     driver.get(f"{base_url}?category={category}")
-    time.sleep(1)
+    pacing.pause(1)
 
     # Confirm task is added
     row = wait.until(EC.presence_of_element_located((By.XPATH, f"//td[contains(text(), '{unique_task}')]/..")))
@@ -46,12 +45,12 @@ def test_todo_app(driver):
     driver.execute_script("arguments[0].click();", checkbox)
 
     # Click update
-    wait_and_click(driver, By.NAME, "update_tasks")
-    time.sleep(1)
+    update = wait_and_click(driver, By.NAME, "update_tasks")
+    wait.until(EC.staleness_of(update))
 
     # Reload and delete the task
     driver.get(f"{base_url}?category={category}")
-    time.sleep(1)
+    pacing.pause(1)
 
     row = wait.until(EC.presence_of_element_located((By.XPATH, f"//td[contains(text(), '{unique_task}')]/..")))
     delete_link = row.find_element(By.LINK_TEXT, "Delete")
@@ -59,6 +58,6 @@ def test_todo_app(driver):
 
     # Final check: ensure task is deleted
     driver.get(f"{base_url}?category={category}")
-    time.sleep(1)
+    pacing.pause(1)
     matches = driver.find_elements(By.XPATH, f"//td[contains(text(), '{unique_task}')]")
     assert len(matches) == 0, "❌ Task was not deleted"
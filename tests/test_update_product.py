@@ -1,132 +1,77 @@
-import time
 import pytest
-import pymysql
-from selenium.webdriver.common.by import By
 
-BASE_URL = "http://localhost/minishop/admin/update_stock.php"
-ADD_URL = "http://localhost/minishop/admin/add_product.php"
-ADMIN_HOME_URL = "http://localhost/minishop/admin/admin_home.php"
+from harness import pacing
+from harness.pages import AdminHomePage, UpdateStockPage
+
+ADMIN_HOME_URL = AdminHomePage.url()
 
 EXPLICIT_WAIT = 10
 STEP_DELAY = 2
 TYPE_DELAY = 0.15
 
-DB_CONFIG = {
-    "host": "localhost",
-    "user": "root",
-    "password": "",   # add password if needed
-    "database": "mini_shop"
-}
-
-
-def db_connect():
-    return pymysql.connect(**DB_CONFIG)
-
 
 def slow_step(msg, wait=STEP_DELAY):
-    print(f"⏳ {msg} (waiting {wait}s)")
-    time.sleep(wait)
+    pacing.step(msg, wait)
 
 
-def slow_type(element, text, delay=TYPE_DELAY):
-    for char in str(text):
-        element.send_keys(char)
-        time.sleep(delay)
+def slow_type(page, name, text, delay=TYPE_DELAY):
+    page.type(name, text, delay=delay)
 
 
-def slow_click(element, wait=STEP_DELAY):
-    element.click()
-    time.sleep(wait)
+def slow_click(page, name, wait=STEP_DELAY):
+    page.click(name, wait=wait)
 
 
 @pytest.mark.usefixtures("login_admin")
 class TestUpdateStock:
-    product_id = None
-    product_name = None
-    original_stock = None
 
-    def test_add_product_for_stock_update(self, login_admin):
-        """Add a product and capture its ID + stock from DB."""
-        driver = login_admin
-        driver.get(ADD_URL)
-        slow_step("Adding product for stock update test")
-
-        TestUpdateStock.product_name = f"StockTest_{int(time.time())}"
-
-        slow_type(driver.find_element(By.ID, "name"), TestUpdateStock.product_name)
-        slow_type(driver.find_element(By.ID, "price"), "789")
-        slow_type(driver.find_element(By.ID, "stock"), "20")
-        slow_click(driver.find_element(By.CLASS_NAME, "add-btn"))
-
-        conn = db_connect()
-        with conn.cursor() as cur:
-            cur.execute("SELECT id, stock FROM products WHERE name=%s", (TestUpdateStock.product_name,))
-            result = cur.fetchone()
-            if result:
-                TestUpdateStock.product_id = str(result[0])
-                TestUpdateStock.original_stock = int(result[1])
-                print(f"📌 Added product ID {TestUpdateStock.product_id}, stock {TestUpdateStock.original_stock}")
-            else:
-                pytest.fail("⚠️ Could not capture product ID from DB after adding")
-        conn.close()
-
-    def test_reduce_existing_product_stock(self, login_admin):
-        """Reduce stock of the added product and validate DB update."""
+    @pytest.mark.needs("product", price=789, stock=20, prefix="StockTest", fresh=True)
+    def test_reduce_existing_product_stock(self, login_admin, db, needs):
+        """Reduce stock of a product created in the DB and validate DB update."""
         driver = login_admin
-        if not TestUpdateStock.product_id:
-            pytest.skip("No product added for update stock test")
+        product_id = str(needs.product.id)
 
-        driver.get(BASE_URL)
-        slow_step(f"Checking product ID {TestUpdateStock.product_id}")
+        page = UpdateStockPage(driver).open()
+        slow_step(f"Checking product ID {product_id}")
 
         # Step 1: Find product
-        slow_type(driver.find_element(By.ID, "product_id"), TestUpdateStock.product_id)
-        slow_click(driver.find_element(By.NAME, "check_product"))
+        slow_type(page, "product_id", product_id)
+        slow_click(page, "check")
 
         # Step 2: Enter reduced stock
-        new_stock = max(0, TestUpdateStock.original_stock - 5)
-        slow_type(driver.find_element(By.ID, "new_stock"), str(new_stock))
-        slow_click(driver.find_element(By.NAME, "update_stock"))
+        new_stock = max(0, needs.product.stock - 5)
+        slow_type(page, "new_stock", str(new_stock))
+        slow_click(page, "update")
 
         # Validate DB update
-        conn = db_connect()
-        with conn.cursor() as cur:
-            cur.execute("SELECT stock FROM products WHERE id=%s", (TestUpdateStock.product_id,))
-            result = cur.fetchone()
-            conn.close()
-
-            assert result and int(result[0]) == new_stock, (
-                f"⚠️ Stock not reduced in DB. Expected {new_stock}, got {result}"
-            )
-            print(f"✅ Stock for product ID {TestUpdateStock.product_id} reduced to {new_stock} in DB")
-
-    def test_update_nonexistent_product_stock(self, login_admin):
+        try:
+            db.wait_for("SELECT stock FROM products WHERE id=%s", (product_id,),
+                        lambda rows: bool(rows) and int(rows[0][0]) == new_stock)
+        except AssertionError as exc:
+            pytest.fail(f"⚠️ Stock not reduced in DB. Expected {new_stock}\n{exc}")
+        print(f"✅ Stock for product ID {product_id} reduced to {new_stock} in DB")
+
+    def test_update_nonexistent_product_stock(self, login_admin, db):
         """Try to update a non-existent product and confirm DB unaffected."""
         driver = login_admin
-        driver.get(BASE_URL)
+        page = UpdateStockPage(driver).open()
         fake_id = "999999"
         slow_step(f"Trying to update stock for non-existent product ID {fake_id}")
 
-        slow_type(driver.find_element(By.ID, "product_id"), fake_id)
-        slow_click(driver.find_element(By.NAME, "check_product"))
-
-        conn = db_connect()
-        with conn.cursor() as cur:
-            cur.execute("SELECT id FROM products WHERE id=%s", (fake_id,))
-            result = cur.fetchone()
-            conn.close()
+        slow_type(page, "product_id", fake_id)
+        slow_click(page, "check")
 
-            assert result is None, f"⚠️ Unexpectedly found product with ID {fake_id} in DB"
-            print(f"✅ No product with ID {fake_id} found in DB (as expected)")
+        result = db.query_one("SELECT id FROM products WHERE id=%s", (fake_id,))
+        assert result is None, f"⚠️ Unexpectedly found product with ID {fake_id} in DB"
+        print(f"✅ No product with ID {fake_id} found in DB (as expected)")
 
     def test_back_button(self, login_admin):
         """Check that back button works correctly."""
         driver = login_admin
-        driver.get(BASE_URL)
+        page = UpdateStockPage(driver).open()
         slow_step("Clicking back button on update_stock.php")
 
-        back_btn = driver.find_element(By.CLASS_NAME, "back-btn")
-        slow_click(back_btn)
+        slow_click(page, "back")
 
         assert ADMIN_HOME_URL in driver.current_url, "⚠️ Back button did not navigate to admin_home.php"
         print("✅ Back button successfully navigated to admin_home.php")